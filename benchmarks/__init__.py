@@ -0,0 +1,5 @@
+"""
+Standalone benchmarks. Run them from the repository root, e.g.
+
+    python -m benchmarks.cache_memory
+"""
@@ -0,0 +1,79 @@
+"""
+Resident memory per 1,000 guilds for each cache profile in utils/cache_policy.py.
+
+Each profile runs in a fresh interpreter. Synthetic GUILD_CREATE payloads
+(channels, roles and a handful of members each) are fed into discord.py's
+ConnectionState, followed by MESSAGE_CREATE traffic, and the growth in
+resident set size is reported.
+
+    python -m benchmarks.cache_memory [--guilds 5000] [--members 50] [--messages 20]
+"""
+
+import argparse
+import asyncio
+import gc
+import os
+import subprocess
+import sys
+
+import discord
+
+from benchmarks.payloads import guild_payload, message_payload, user_payload
+from utils.cache_policy import CACHE_PROFILES, client_options, resolve_cache_policy
+
+
+def rss_bytes() -> int:
+    """
+    Current resident set size. Linux only (falls back to peak RSS elsewhere).
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+async def measure(profile: str, guilds: int, members: int, messages: int) -> float:
+    client = discord.Client(**client_options(resolve_cache_policy({"profile": profile})))
+    state = client._connection
+    state.user = discord.ClientUser(state=state, data=user_payload(1))
+
+    gc.collect()
+    before = rss_bytes()
+    for index in range(guilds):
+        state._add_guild_from_data(guild_payload(index, members))
+    for index in range(guilds):
+        for message in range(messages):
+            state.parse_message_create(message_payload(index, message, members))
+    gc.collect()
+    return (rss_bytes() - before) / guilds * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--guilds", type=int, default=5000)
+    parser.add_argument("--members", type=int, default=50, help="members delivered per GUILD_CREATE")
+    parser.add_argument("--messages", type=int, default=20, help="messages received per guild")
+    parser.add_argument("--profile", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.profile:
+        print(asyncio.run(measure(args.profile, args.guilds, args.members, args.messages)))
+        return
+
+    print(f"{args.guilds} guilds, {args.members} members and {args.messages} messages per guild")
+    print(f"{'profile':<12} {'RSS per 1,000 guilds':>22}")
+    for profile in CACHE_PROFILES:
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.cache_memory", "--profile", profile, "--guilds", str(args.guilds),
+             "--members", str(args.members), "--messages", str(args.messages)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        per_thousand = float(output.strip().splitlines()[-1])
+        print(f"{profile:<12} {per_thousand / 1024 / 1024:>19.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Two-cluster check against the offline Discord simulator.
+
+Starts ``benchmarks.discord_sim`` and runs ``launcher.launch`` with two shards
+split across two cluster processes, the status job on a short interval. Then
+it checks what the launcher promises:
+
+- each cluster only makes REST calls for guilds on its own shard, and reaches
+  every one of them;
+- the Minecraft status probe runs once per tick for all clusters together
+  (the SharedCache lease works across processes), not once per cluster.
+
+Inside the clusters the probe is replaced by a counter, so nothing leaves
+the machine. Exits with status 1 if a check fails.
+
+    python -m benchmarks.cluster_check [--guilds 20] [--interval 1] [--ticks 3]
+"""
+
+import argparse
+import asyncio
+import collections
+import functools
+import multiprocessing
+import os
+import queue
+import sys
+import tempfile
+import time
+from typing import List
+
+from discord.ext import commands
+
+import bot as bot_module
+import launcher
+from benchmarks.discord_sim import FakeDiscord
+from utils import probes
+
+SHARD_COUNT = 2
+STATUS_JOB = "minecraft.update_status"
+
+
+class ShardedBot(bot_module.DiscordBot, commands.AutoShardedBot):
+    """
+    ``DiscordBot`` on ``AutoShardedBot``, as bot.py builds it when sharding is
+    enabled in config.json.
+    """
+
+
+def cluster_bot(events: multiprocessing.Queue, interval: float, duration: float, **options) -> ShardedBot:
+    """
+    Bot factory run inside each cluster process. Only the status job is kept,
+    on ``interval`` without jitter. Probes and the job's run count are
+    reported through ``events``, and the bot closes ``duration`` seconds
+    after it is ready.
+    """
+    cluster = options["shard_ids"][0]
+    bot = ShardedBot(**options)
+    # Lets the simulator tell the clusters' REST calls apart.
+    bot.http.user_agent += f" cluster/{cluster}"
+
+    async def counted_status(self, target: str):
+        events.put(("probe", cluster, time.time()))
+        raise OSError("not probed in the cluster check")
+
+    probes.StatusProber.status = counted_status
+
+    async def stop_later() -> None:
+        await bot.wait_until_ready()
+        await asyncio.sleep(duration)
+        events.put(("runs", cluster, bot.scheduler.jobs[STATUS_JOB].runs))
+        await bot.close()
+
+    setup_hook = bot.setup_hook
+
+    async def short_jobs_setup_hook() -> None:
+        await setup_hook()
+        for name in list(bot.scheduler.jobs):
+            if name != STATUS_JOB:
+                bot.scheduler.remove_job(name)
+        job = bot.scheduler.jobs[STATUS_JOB]
+        job.interval, job.jitter = interval, 0.0
+        asyncio.create_task(stop_later())
+
+    bot.setup_hook = short_jobs_setup_hook
+    return bot
+
+
+def cluster_of(user_agent: str):
+    marker = " cluster/"
+    return int(user_agent.rsplit(marker, 1)[1]) if marker in user_agent else None
+
+
+def check_guilds(sim: FakeDiscord) -> List[str]:
+    touched = collections.defaultdict(set)
+    for call in sim.calls:
+        cluster = cluster_of(call.user_agent)
+        guild_id = sim.channels.get(int(call.major)) if call.major.isdigit() else None
+        if cluster is not None and guild_id is not None:
+            touched[cluster].add(guild_id)
+
+    failures = []
+    for shard in range(SHARD_COUNT):
+        own = {guild_id for guild_id in sim.guilds if sim.shard_of(guild_id, SHARD_COUNT) == shard}
+        foreign = touched[shard] - own
+        missing = own - touched[shard]
+        print(f"cluster {shard}: touched {len(own) - len(missing)}/{len(own)} of its guilds, {len(foreign)} of other shards")
+        if foreign:
+            failures.append(f"cluster {shard} touched {len(foreign)} guild(s) of another shard")
+        if missing:
+            failures.append(f"cluster {shard} never reached {len(missing)} of its guild(s)")
+    return failures
+
+
+def check_probes(events: list, interval: float) -> List[str]:
+    probe_times = sorted(at for kind, _, at in events if kind == "probe")
+    runs = {cluster: count for kind, cluster, count in events if kind == "runs"}
+    ticks = max(runs.values(), default=0)
+    print(f"status job runs per cluster: {dict(sorted(runs.items()))}, probes across clusters: {len(probe_times)}")
+
+    failures = []
+    if len(runs) != SHARD_COUNT:
+        failures.append(f"only {len(runs)} of {SHARD_COUNT} clusters reported their job runs")
+    # A cluster that started a moment later can add one tick at the end.
+    if not ticks - 1 <= len(probe_times) <= ticks:
+        failures.append(f"{len(probe_times)} probes for {ticks} ticks, expected one per tick")
+    gaps = [later - earlier for earlier, later in zip(probe_times, probe_times[1:])]
+    if gaps and min(gaps) < interval / 2:
+        failures.append(f"two probes {min(gaps):.2f}s apart within one {interval:g}s tick")
+    return failures
+
+
+def drain(events: multiprocessing.Queue) -> list:
+    drained = []
+    while True:
+        try:
+            drained.append(events.get(timeout=1.0))
+        except queue.Empty:
+            return drained
+
+
+async def run(args: argparse.Namespace) -> List[str]:
+    """
+    Runs the clusters and returns the failed checks (empty when all passed).
+    """
+    sim = FakeDiscord(args.guilds, args.members)
+    await sim.start()
+    sim.install()
+    events = multiprocessing.Queue()
+    print(f"{args.guilds} guilds, {SHARD_COUNT} shards in {SHARD_COUNT} clusters, "
+          f"status job every {args.interval:g}s for {args.ticks} ticks")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # The clusters are forked, so they inherit this config and the simulator's routes.
+        bot_module.config["database"] = os.path.join(tmp, "cluster_check.db")
+        bot_module.config["metrics"] = dict(bot_module.config.get("metrics", {}), enabled=False)
+        factory = functools.partial(cluster_bot, events, args.interval, args.interval * args.ticks)
+        await asyncio.to_thread(launcher.launch, "sim", SHARD_COUNT, SHARD_COUNT, factory)
+
+    await sim.stop()
+    failures = check_guilds(sim) + check_probes(drain(events), args.interval)
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    return failures
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--guilds", type=int, default=20)
+    parser.add_argument("--members", type=int, default=5)
+    parser.add_argument("--interval", type=float, default=1.0, help="status job interval in seconds")
+    parser.add_argument("--ticks", type=int, default=3)
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    if asyncio.run(run(parse_args())):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Per-command cost of the latency histograms and error counters.
+
+Times DiscordBot.record_command, which every prefix, hybrid and slash command
+goes through on completion or error, for a successful command and for one
+that failed, spread over a handful of command names as in production. The
+cost of the loop itself is measured separately and subtracted.
+
+    python -m benchmarks.command_metrics [--calls 1000000] [--repeat 5]
+"""
+
+import argparse
+import time
+
+from discord.ext import commands
+
+import bot as bot_module
+
+NAMES = ["status", "player-list", "calculate", "help", "ping", "advancedpoll", "modpack", "stats"]
+
+
+def best_of(repeat: int, run) -> float:
+    """
+    Fastest of ``repeat`` runs, in seconds; the others were disturbed by something else.
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case, the fastest is reported")
+    args = parser.parse_args()
+
+    bot = bot_module.DiscordBot()
+    names = [NAMES[index % len(NAMES)] for index in range(args.calls)]
+    started_at = time.perf_counter()
+    error = commands.CommandInvokeError(ValueError("benchmark"))
+
+    def empty() -> None:
+        for name in names:
+            pass
+
+    def completed() -> None:
+        record = bot.record_command
+        for name in names:
+            record(name, started_at)
+
+    def failed() -> None:
+        record = bot.record_command
+        for name in names:
+            record(name, started_at, error)
+
+    overhead = best_of(args.repeat, empty)
+    print(f"{args.calls:,} calls over {len(NAMES)} commands, best of {args.repeat}")
+    for label, run in (("completed command", completed), ("failed command", failed)):
+        elapsed = best_of(args.repeat, run) - overhead
+        print(f"{label:<20} {elapsed / args.calls * 1e6:>8.3f} µs per call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,608 @@
+"""
+Offline stand-in for the Discord HTTP API and gateway.
+
+Serves just enough of both for the whole bot (``bot.py`` plus every cog) to
+log in, identify, receive synthetic guilds and answer commands, without a
+Discord account or network access:
+
+- REST: users, application info, gateway discovery, application command sync,
+  channel messages (send, history, edit, delete), typing, interaction
+  callbacks and interaction webhooks. Unknown routes answer 404.
+- Gateway: a websocket speaking the v10 JSON protocol with ``zlib-stream``
+  compression. It handles HELLO/IDENTIFY/heartbeats and member chunk
+  requests, and delivers READY plus one GUILD_CREATE per guild of the
+  identifying shard.
+
+Per-route buckets (keyed by the major parameter, like Discord's) and a global
+limit answer 429 with the usual headers. Every REST call is logged as a
+``RestCall``. ``dispatch_message`` and ``dispatch_interaction`` push traffic
+into the bot and remember when they did. The bot's first reply in that
+channel, or its callback for that interaction, closes the measurement. The
+load-test driver (``benchmarks.load_test``) reads the results.
+
+Point discord.py at it with ``FakeDiscord.install()``.
+"""
+
+import asyncio
+import collections
+import datetime
+import itertools
+import json
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple
+
+import discord
+import yarl
+from aiohttp import web
+from discord.gateway import DiscordWebSocket
+from discord.http import Route
+
+from benchmarks.payloads import guild_payload, user_payload
+
+BOT_ID = 10**16
+API_PREFIX = "/api/v10"
+# Channels 0 and 1 of every guild carry the names the background jobs look for.
+CHANNEL_NAMES = {0: "server-status", 1: "modpack"}
+COMMAND_CHANNELS = range(2, 8)
+
+# (uses, seconds) per route and major parameter, roughly what Discord hands out.
+RATE_LIMITS = {
+    ("POST", "/channels/{channel_id}/messages"): (5, 5.0),
+    ("GET", "/channels/{channel_id}/messages"): (5, 5.0),
+    ("PATCH", "/channels/{channel_id}/messages/{message_id}"): (5, 5.0),
+    ("DELETE", "/channels/{channel_id}/messages/{message_id}"): (5, 1.0),
+    ("POST", "/channels/{channel_id}/typing"): (5, 5.0),
+    ("PUT", "/applications/{application_id}/commands"): (2, 60.0),
+    ("POST", "/webhooks/{application_id}/{token}"): (5, 5.0),
+    ("PATCH", "/webhooks/{application_id}/{token}/messages/{message_id}"): (5, 5.0),
+}
+GLOBAL_LIMIT = (50, 1.0)
+# Interaction callbacks don't count towards the global limit.
+GLOBAL_EXEMPT = {("POST", "/interactions/{interaction_id}/{token}/callback")}
+
+
+def json_response(data, status: int = 200, headers: Optional[Dict[str, str]] = None) -> web.Response:
+    # discord.py only decodes bodies whose Content-Type is exactly application/json (no charset).
+    return web.Response(body=json.dumps(data).encode(), status=status, headers=headers, content_type="application/json")
+
+
+@dataclass
+class RestCall:
+    at: float
+    method: str
+    route: str
+    major: str
+    status: int
+    scope: Optional[str] = None
+    # The caller's User-Agent, so calls from several clusters can be told apart.
+    user_agent: str = ""
+
+
+class Bucket:
+    """
+    Fixed window: ``limit`` uses per ``per`` seconds, starting at the first use.
+    """
+
+    def __init__(self, limit: int, per: float) -> None:
+        self.limit = limit
+        self.per = per
+        self.remaining = limit
+        self.reset_at = 0.0
+
+    def acquire(self, now: float) -> Optional[float]:
+        """
+        Uses one slot, or returns how long until the window resets when none is left.
+        """
+        if now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = now + self.per
+        if self.remaining == 0:
+            return self.reset_at - now
+        self.remaining -= 1
+        return None
+
+
+class GatewayConnection:
+    def __init__(self, ws: web.WebSocketResponse, compress: Optional[str]) -> None:
+        self.ws = ws
+        self.compressor = zlib.compressobj() if compress == "zlib-stream" else None
+        self.sequence = 0
+        self.shard = (0, 1)
+
+    async def send(self, op: int, data=None, event: Optional[str] = None) -> None:
+        payload = {"op": op, "d": data, "s": None, "t": event}
+        if event is not None:
+            self.sequence += 1
+            payload["s"] = self.sequence
+        raw = json.dumps(payload)
+        if self.compressor is None:
+            await self.ws.send_str(raw)
+        else:
+            # Anything else (zstd-stream) falls back to plain text frames, which discord.py also accepts.
+            await self.ws.send_bytes(self.compressor.compress(raw.encode()) + self.compressor.flush(zlib.Z_SYNC_FLUSH))
+
+
+class FakeDiscord:
+    def __init__(self, guilds: int, members: int = 20, rest_latency: float = 0.0) -> None:
+        self.rest_latency = rest_latency
+        self.bot_user = dict(user_payload(BOT_ID), bot=True)
+        self.guilds: Dict[int, dict] = {}
+        self.channels: Dict[int, int] = {}  # channel id -> guild id
+        for index in range(guilds):
+            data = guild_payload(index, members)
+            for position, name in CHANNEL_NAMES.items():
+                data["channels"][position]["name"] = name
+            data["members"].append({"user": self.bot_user, "roles": [], "joined_at": "2024-01-01T00:00:00+00:00",
+                                    "deaf": False, "mute": False, "flags": 0})
+            data["member_count"] = len(data["members"])
+            data["roles"][0]["permissions"] = str(discord.Permissions.all().value)
+            guild_id = int(data["id"])
+            self.guilds[guild_id] = data
+            for channel in data["channels"]:
+                self.channels[int(channel["id"])] = guild_id
+
+        self.dm_channels: Dict[int, dict] = {}  # user id -> DM channel
+        self.messages: Dict[int, List[dict]] = collections.defaultdict(list)
+        self.commands: List[dict] = []
+        self.calls: List[RestCall] = []
+        self.buckets: Dict[Tuple[str, str, str], Bucket] = {}
+        self.global_bucket = Bucket(*GLOBAL_LIMIT)
+        self.connections: List[GatewayConnection] = []
+        self.ready = asyncio.Event()
+
+        # Open measurements: channel id -> [(sent at, tag)], interaction id -> (sent at, tag).
+        self.pending_messages: Dict[int, Deque[Tuple[float, str]]] = collections.defaultdict(collections.deque)
+        self.pending_interactions: Dict[int, Tuple[float, str]] = {}
+        self.latencies: Dict[str, List[float]] = collections.defaultdict(list)
+
+        self._ids = itertools.count(discord.utils.time_snowflake(discord.utils.utcnow()))
+        self.app = web.Application(middlewares=[self.rate_limit_middleware])
+        self.app.add_routes([
+            web.get("/gateway-ws", self.gateway),
+            web.get(API_PREFIX + "/users/@me", self.get_me),
+            web.post(API_PREFIX + "/users/@me/channels", self.create_dm),
+            web.get(API_PREFIX + "/oauth2/applications/@me", self.get_application),
+            web.get(API_PREFIX + "/gateway", self.get_gateway),
+            web.get(API_PREFIX + "/gateway/bot", self.get_gateway),
+            web.get(API_PREFIX + "/applications/{application_id}/commands", self.get_commands),
+            web.put(API_PREFIX + "/applications/{application_id}/commands", self.put_commands),
+            web.get(API_PREFIX + "/applications/{application_id}/guilds/{guild_id}/commands", self.get_guild_commands),
+            web.put(API_PREFIX + "/applications/{application_id}/guilds/{guild_id}/commands", self.put_guild_commands),
+            web.get(API_PREFIX + "/channels/{channel_id}/messages", self.get_messages),
+            web.post(API_PREFIX + "/channels/{channel_id}/messages", self.create_message),
+            web.patch(API_PREFIX + "/channels/{channel_id}/messages/{message_id}", self.edit_message),
+            web.delete(API_PREFIX + "/channels/{channel_id}/messages/{message_id}", self.delete_message),
+            web.post(API_PREFIX + "/channels/{channel_id}/typing", self.typing),
+            web.post(API_PREFIX + "/interactions/{interaction_id}/{token}/callback", self.interaction_callback),
+            web.post(API_PREFIX + "/webhooks/{application_id}/{token}", self.create_followup),
+            web.get(API_PREFIX + "/webhooks/{application_id}/{token}/messages/{message_id}", self.get_webhook_message),
+            web.patch(API_PREFIX + "/webhooks/{application_id}/{token}/messages/{message_id}", self.edit_webhook_message),
+            web.delete(API_PREFIX + "/webhooks/{application_id}/{token}/messages/{message_id}", self.delete_webhook_message),
+        ])
+        self.app.router.add_route("*", API_PREFIX + "/{tail:.*}", self.unknown)
+        self.runner: Optional[web.AppRunner] = None
+        self.url = ""
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.runner = web.AppRunner(self.app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{port}"
+
+    async def stop(self) -> None:
+        for connection in self.connections:
+            await connection.ws.close()
+        if self.runner is not None:
+            await self.runner.cleanup()
+
+    def install(self) -> None:
+        """
+        Points discord.py's REST routes and default gateway at this server.
+        """
+        Route.BASE = self.url + API_PREFIX
+        DiscordWebSocket.DEFAULT_GATEWAY = yarl.URL(self.gateway_url)
+
+    @property
+    def gateway_url(self) -> str:
+        return self.url.replace("http://", "ws://") + "/gateway-ws"
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    # REST plumbing
+
+    @web.middleware
+    async def rate_limit_middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        if request.path == "/gateway-ws":
+            return await handler(request)
+        if self.rest_latency:
+            await asyncio.sleep(self.rest_latency)
+
+        resource = request.match_info.route.resource
+        route = resource.canonical[len(API_PREFIX):] if resource is not None else request.path
+        info = request.match_info
+        major = info.get("channel_id") or info.get("guild_id") or info.get("token") or ""
+        now = time.monotonic()
+        call = RestCall(now, request.method, route, major, 200, user_agent=request.headers.get("User-Agent", ""))
+        self.calls.append(call)
+
+        headers = {}
+        if (request.method, route) not in GLOBAL_EXEMPT:
+            retry_after = self.global_bucket.acquire(now)
+            if retry_after is not None:
+                call.status, call.scope = 429, "global"
+                return self.too_many_requests(retry_after, is_global=True)
+
+        limit = RATE_LIMITS.get((request.method, route))
+        if limit is not None:
+            bucket = self.buckets.get((request.method, route, major))
+            if bucket is None:
+                bucket = self.buckets[(request.method, route, major)] = Bucket(*limit)
+            retry_after = bucket.acquire(now)
+            bucket_hash = f"{request.method}:{route}"
+            if retry_after is not None:
+                call.status, call.scope = 429, "user"
+                return self.too_many_requests(retry_after, bucket=bucket, bucket_hash=bucket_hash)
+            headers = self.rate_limit_headers(bucket, bucket_hash, now)
+
+        try:
+            response = await handler(request)
+        except ConnectionResetError:
+            # The bot shut down with this request in flight.
+            call.status = 499
+            return web.Response(status=499)
+        call.status = response.status
+        response.headers.update(headers)
+        return response
+
+    @staticmethod
+    def rate_limit_headers(bucket: Bucket, bucket_hash: str, now: float) -> Dict[str, str]:
+        reset_after = max(0.0, bucket.reset_at - now)
+        return {
+            "X-RateLimit-Limit": str(bucket.limit),
+            "X-RateLimit-Remaining": str(bucket.remaining),
+            "X-RateLimit-Reset": f"{time.time() + reset_after:.3f}",
+            "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+            "X-RateLimit-Bucket": bucket_hash,
+        }
+
+    def too_many_requests(self, retry_after: float, bucket: Optional[Bucket] = None,
+                          bucket_hash: str = "", is_global: bool = False) -> web.Response:
+        # discord.py treats a 429 without a Via header as a Cloudflare ban and gives up instead of retrying.
+        headers = {"Retry-After": f"{retry_after:.3f}", "Via": "1.1 google",
+                   "X-RateLimit-Scope": "global" if is_global else "user"}
+        if is_global:
+            headers["X-RateLimit-Global"] = "true"
+        else:
+            headers.update(self.rate_limit_headers(bucket, bucket_hash, time.monotonic()))
+        return json_response(
+            {"message": "You are being rate limited.", "retry_after": retry_after, "global": is_global, "code": 0},
+            status=429,
+            headers=headers,
+        )
+
+    @staticmethod
+    async def read_payload(request: web.Request) -> dict:
+        if request.content_type.startswith("multipart/"):
+            form = await request.post()
+            return json.loads(form.get("payload_json", "{}"))
+        if not request.can_read_body:
+            return {}
+        return await request.json()
+
+    @staticmethod
+    def not_found(message: str) -> web.Response:
+        return json_response({"message": message, "code": 10000}, status=404)
+
+    async def unknown(self, request: web.Request) -> web.Response:
+        return self.not_found(f"Unknown route {request.method} {request.path}")
+
+    # Users, application and gateway discovery
+
+    async def get_me(self, request: web.Request) -> web.Response:
+        return json_response(self.bot_user)
+
+    async def create_dm(self, request: web.Request) -> web.Response:
+        recipient_id = int((await self.read_payload(request))["recipient_id"])
+        channel = self.dm_channels.get(recipient_id)
+        if channel is None:
+            channel = self.dm_channels[recipient_id] = {
+                "id": str(self.next_id()),
+                "type": 1,
+                "last_message_id": None,
+                "recipients": [user_payload(recipient_id)],
+            }
+        return json_response(channel)
+
+    async def get_application(self, request: web.Request) -> web.Response:
+        return json_response({
+            "id": str(BOT_ID),
+            "name": "Ventra (simulated)",
+            "description": "",
+            "icon": None,
+            "bot_public": True,
+            "bot_require_code_grant": False,
+            "owner": user_payload(BOT_ID + 1),
+            "verify_key": "0" * 64,
+            "flags": 0,
+        })
+
+    async def get_gateway(self, request: web.Request) -> web.Response:
+        return json_response({
+            "url": self.gateway_url,
+            "shards": 1,
+            "session_start_limit": {"total": 1000, "remaining": 1000, "reset_after": 0, "max_concurrency": 16},
+        })
+
+    # Application commands
+
+    def store_commands(self, payload: List[dict], guild_id: Optional[str] = None) -> List[dict]:
+        commands = []
+        for command in payload:
+            command = dict(command, id=str(self.next_id()), application_id=str(BOT_ID), version="1")
+            if guild_id is not None:
+                command["guild_id"] = guild_id
+            commands.append(command)
+        return commands
+
+    async def get_commands(self, request: web.Request) -> web.Response:
+        return json_response(self.commands)
+
+    async def put_commands(self, request: web.Request) -> web.Response:
+        self.commands = self.store_commands(await self.read_payload(request))
+        return json_response(self.commands)
+
+    async def get_guild_commands(self, request: web.Request) -> web.Response:
+        return json_response([])
+
+    async def put_guild_commands(self, request: web.Request) -> web.Response:
+        payload = await self.read_payload(request)
+        return json_response(self.store_commands(payload, request.match_info["guild_id"]))
+
+    # Channel messages
+
+    def build_message(self, channel_id: int, payload: dict, author: Optional[dict] = None,
+                      message_id: Optional[int] = None) -> dict:
+        guild_id = self.channels.get(channel_id)
+        message = {
+            "id": str(message_id or self.next_id()),
+            "channel_id": str(channel_id),
+            "author": author or self.bot_user,
+            "content": payload.get("content") or "",
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "edited_timestamp": None,
+            "tts": False,
+            "mention_everyone": False,
+            "mentions": [],
+            "mention_roles": [],
+            "attachments": [],
+            "embeds": payload.get("embeds") or [],
+            "components": payload.get("components") or [],
+            "pinned": False,
+            "type": 0,
+        }
+        if guild_id is not None:
+            message["guild_id"] = str(guild_id)
+        return message
+
+    def known_channel(self, channel_id: int) -> bool:
+        return channel_id in self.channels or any(int(c["id"]) == channel_id for c in self.dm_channels.values())
+
+    def find_message(self, channel_id: int, message_id: int) -> Optional[dict]:
+        for message in self.messages.get(channel_id, ()):
+            if int(message["id"]) == message_id:
+                return message
+        return None
+
+    def answered(self, channel_id: int) -> None:
+        pending = self.pending_messages.get(channel_id)
+        if pending:
+            sent_at, tag = pending.popleft()
+            self.latencies[tag].append(time.monotonic() - sent_at)
+
+    async def get_messages(self, request: web.Request) -> web.Response:
+        channel_id = int(request.match_info["channel_id"])
+        if not self.known_channel(channel_id):
+            return self.not_found("Unknown Channel")
+        limit = min(int(request.query.get("limit", 50)), 100)
+        before = int(request.query.get("before", 0)) or None
+        history = [m for m in reversed(self.messages.get(channel_id, ())) if before is None or int(m["id"]) < before]
+        return json_response(history[:limit])
+
+    async def create_message(self, request: web.Request) -> web.Response:
+        channel_id = int(request.match_info["channel_id"])
+        if not self.known_channel(channel_id):
+            return self.not_found("Unknown Channel")
+        message = self.build_message(channel_id, await self.read_payload(request))
+        self.messages[channel_id].append(message)
+        self.answered(channel_id)
+        return json_response(message)
+
+    async def edit_message(self, request: web.Request) -> web.Response:
+        channel_id = int(request.match_info["channel_id"])
+        message = self.find_message(channel_id, int(request.match_info["message_id"]))
+        if message is None:
+            return self.not_found("Unknown Message")
+        payload = await self.read_payload(request)
+        for key in ("content", "embeds", "components"):
+            if key in payload:
+                message[key] = payload[key]
+        message["edited_timestamp"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        return json_response(message)
+
+    async def delete_message(self, request: web.Request) -> web.Response:
+        channel_id = int(request.match_info["channel_id"])
+        message = self.find_message(channel_id, int(request.match_info["message_id"]))
+        if message is None:
+            return self.not_found("Unknown Message")
+        self.messages[channel_id].remove(message)
+        return web.Response(status=204)
+
+    async def typing(self, request: web.Request) -> web.Response:
+        return web.Response(status=204)
+
+    # Interactions
+
+    async def interaction_callback(self, request: web.Request) -> web.Response:
+        interaction_id = int(request.match_info["interaction_id"])
+        payload = await self.read_payload(request)
+        pending = self.pending_interactions.pop(interaction_id, None)
+        if pending is not None:
+            sent_at, tag = pending
+            self.latencies[tag].append(time.monotonic() - sent_at)
+
+        response_type = payload.get("type", 4)
+        data = payload.get("data") or {}
+        body = {"interaction": {
+            "id": str(interaction_id),
+            "type": 2,
+            "response_message_loading": response_type == 5,
+            "response_message_ephemeral": bool(data.get("flags", 0) & 64),
+        }}
+        if response_type == 4:
+            message = self.build_message(0, data)
+            body["interaction"]["response_message_id"] = message["id"]
+            body["resource"] = {"type": response_type, "message": message}
+        return json_response(body)
+
+    async def create_followup(self, request: web.Request) -> web.Response:
+        return json_response(self.build_message(0, await self.read_payload(request)))
+
+    async def get_webhook_message(self, request: web.Request) -> web.Response:
+        return json_response(self.build_message(0, {}))
+
+    async def edit_webhook_message(self, request: web.Request) -> web.Response:
+        return json_response(self.build_message(0, await self.read_payload(request)))
+
+    async def delete_webhook_message(self, request: web.Request) -> web.Response:
+        return web.Response(status=204)
+
+    # Gateway
+
+    def shard_of(self, guild_id: int, shard_count: int) -> int:
+        return (guild_id >> 22) % shard_count
+
+    async def gateway(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+        connection = GatewayConnection(ws, request.query.get("compress"))
+        self.connections.append(connection)
+        await connection.send(10, {"heartbeat_interval": 41250})
+        try:
+            async for frame in ws:
+                payload = json.loads(frame.data)
+                op = payload["op"]
+                if op == 1:
+                    await connection.send(11)
+                elif op == 2:
+                    await self.identify(connection, payload["d"])
+                elif op == 6:
+                    # No sessions to resume here; make the client identify again.
+                    await connection.send(9, False)
+                elif op == 8:
+                    await self.chunk_members(connection, payload["d"])
+        finally:
+            self.connections.remove(connection)
+        return ws
+
+    async def identify(self, connection: GatewayConnection, data: dict) -> None:
+        shard_id, shard_count = data.get("shard") or (0, 1)
+        connection.shard = (shard_id, shard_count)
+        guilds = [g for guild_id, g in self.guilds.items() if self.shard_of(guild_id, shard_count) == shard_id]
+        await connection.send(0, {
+            "v": 10,
+            "user": self.bot_user,
+            "guilds": [{"id": g["id"], "unavailable": True} for g in guilds],
+            "session_id": f"sim-{shard_id}",
+            "resume_gateway_url": self.gateway_url,
+            "shard": [shard_id, shard_count],
+            "application": {"id": str(BOT_ID), "flags": 0},
+            "private_channels": [],
+            "relationships": [],
+        }, "READY")
+        for guild in guilds:
+            await connection.send(0, dict(guild, unavailable=False), "GUILD_CREATE")
+        self.ready.set()
+
+    async def chunk_members(self, connection: GatewayConnection, data: dict) -> None:
+        guild_id = int(data["guild_id"])
+        guild = self.guilds.get(guild_id)
+        await connection.send(0, {
+            "guild_id": str(guild_id),
+            "members": guild["members"] if guild else [],
+            "chunk_index": 0,
+            "chunk_count": 1,
+            "nonce": data.get("nonce"),
+        }, "GUILD_MEMBERS_CHUNK")
+
+    def connection_for(self, guild_id: int) -> Optional[GatewayConnection]:
+        for connection in self.connections:
+            shard_id, shard_count = connection.shard
+            if self.shard_of(guild_id, shard_count) == shard_id:
+                return connection
+        return None
+
+    # Traffic
+
+    async def dispatch_message(self, guild_id: int, channel_id: int, author: dict, content: str,
+                               tag: Optional[str] = None) -> None:
+        """
+        Sends MESSAGE_CREATE for a member's message. With ``tag``, the bot's
+        next message in that channel is recorded as the reply latency.
+        """
+        message = self.build_message(channel_id, {"content": content}, author=author)
+        message["member"] = {"roles": [], "joined_at": "2024-01-01T00:00:00+00:00", "deaf": False, "mute": False, "flags": 0}
+        self.messages[channel_id].append(message)
+        if tag is not None:
+            self.pending_messages[channel_id].append((time.monotonic(), tag))
+        await self.connection_for(guild_id).send(0, message, "MESSAGE_CREATE")
+
+    async def dispatch_interaction(self, guild_id: int, channel_id: int, author: dict, name: str,
+                                   options: Optional[List[dict]] = None, tag: Optional[str] = None) -> None:
+        """
+        Sends INTERACTION_CREATE for the slash command ``name``. With ``tag``,
+        the bot's callback is recorded as the response latency.
+        """
+        command = next((c for c in self.commands if c["name"] == name), None)
+        if command is None:
+            raise KeyError(f"Slash command {name!r} was never synced")
+        guild = self.guilds[guild_id]
+        channel = next(c for c in guild["channels"] if int(c["id"]) == channel_id)
+        interaction_id = self.next_id()
+        permissions = str(discord.Permissions.all().value)
+        data = {
+            "id": str(interaction_id),
+            "application_id": str(BOT_ID),
+            "type": 2,
+            "token": f"sim-token-{interaction_id}",
+            "version": 1,
+            "guild_id": str(guild_id),
+            "channel_id": str(channel_id),
+            "channel": dict(channel, guild_id=str(guild_id)),
+            "member": {"user": author, "roles": [], "joined_at": "2024-01-01T00:00:00+00:00", "deaf": False,
+                       "mute": False, "flags": 0, "permissions": permissions},
+            "app_permissions": permissions,
+            "locale": "en-US",
+            "guild_locale": "en-US",
+            "entitlements": [],
+            "authorizing_integration_owners": {"0": str(guild_id)},
+            "context": 0,
+            "attachment_size_limit": 8 * 1024 * 1024,
+            "data": {"id": command["id"], "name": name, "type": 1, "options": options or []},
+        }
+        if tag is not None:
+            self.pending_interactions[interaction_id] = (time.monotonic(), tag)
+        await self.connection_for(guild_id).send(0, data, "INTERACTION_CREATE")
+
+    def unanswered(self) -> Dict[str, int]:
+        counts: Dict[str, int] = collections.Counter()
+        for pending in self.pending_messages.values():
+            for _, tag in pending:
+                counts[tag] += 1
+        for _, tag in self.pending_interactions.values():
+            counts[tag] += 1
+        return dict(counts)
@@ -0,0 +1,138 @@
+"""
+Default runtime vs the fast runtime (uvloop + orjson) from utils/runtime.py.
+
+Measures message throughput on each event loop, and the time to decode a
+Modrinth version list like the one polled by the modpack cog. Messages go
+through ``bot.dispatch("message", ...)`` in batches, like the gateway feeds
+them, so every message is a task scheduled and run by the loop rather than a
+direct ``on_message`` call that almost never yields.
+
+    pip install -r requirements-fast.txt
+    python -m benchmarks.fast_runtime [--messages 100000] [--versions 100] [--batch 1000] [--repeat 3]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import discord
+
+import bot as bot_module
+from benchmarks.message_throughput import GUILDS, build_messages
+from benchmarks.payloads import guild_payload, user_payload
+from utils import runtime
+
+
+def modrinth_payload(versions: int) -> bytes:
+    """
+    A version list shaped like GET /v2/project/{slug}/version.
+    """
+    return json.dumps([
+        {
+            "id": f"v{index:07d}",
+            "project_id": "ventramodpack",
+            "author_id": "author01",
+            "name": f"Ventra Modpack 1.{index}",
+            "version_number": f"1.{index}.0",
+            "changelog": "- Updated mods\n- Fixed crashes on startup\n" * 40,
+            "date_published": "2024-01-01T00:00:00.000000Z",
+            "downloads": 1000 + index,
+            "version_type": "release",
+            "status": "listed",
+            "featured": False,
+            "game_versions": ["1.20.1"],
+            "loaders": ["fabric"],
+            "dependencies": [
+                {"version_id": None, "project_id": f"dep{dep:05d}", "file_name": None, "dependency_type": "embedded"}
+                for dep in range(30)
+            ],
+            "files": [
+                {
+                    "hashes": {"sha1": "0" * 40, "sha512": "0" * 128},
+                    "url": f"https://cdn.modrinth.com/data/ventramodpack/versions/{index}/ventra.mrpack",
+                    "filename": "ventra.mrpack",
+                    "primary": True,
+                    "size": 123456,
+                    "file_type": None,
+                }
+            ],
+        }
+        for index in range(versions)
+    ]).encode("utf-8")
+
+
+def parse_time(payload: bytes, iterations: int = 50) -> float:
+    """
+    Decodes the raw response body, as ``Modpack.fetch_versions`` does with
+    ``runtime.loads(await response.read())``.
+    """
+    started = time.perf_counter()
+    for _ in range(iterations):
+        runtime.loads(payload)
+    return (time.perf_counter() - started) / iterations
+
+
+async def message_throughput(count: int, batch: int = 1000) -> float:
+    bot = bot_module.DiscordBot()
+    state = bot._connection
+    state.user = discord.ClientUser(state=state, data=user_payload(1))
+    bot.refresh_prefix_filter()
+
+    @bot.command()
+    async def noop(ctx):
+        pass
+
+    for index in range(GUILDS):
+        state._add_guild_from_data(guild_payload(index, 20))
+    messages = build_messages(bot, count, 0.01)
+
+    # Counts finished on_message tasks so each batch can be drained before the next.
+    on_message = bot.on_message
+    processed = 0
+    drained = asyncio.Event()
+    target = 0
+
+    async def counted_on_message(message: discord.Message) -> None:
+        nonlocal processed
+        try:
+            await on_message(message)
+        finally:
+            processed += 1
+            if processed == target:
+                drained.set()
+
+    bot.on_message = counted_on_message
+
+    async with bot:
+        started = time.perf_counter()
+        for offset in range(0, count, batch):
+            chunk = messages[offset:offset + batch]
+            target += len(chunk)
+            drained.clear()
+            for message in chunk:
+                bot.dispatch("message", message)
+            await drained.wait()
+        elapsed = time.perf_counter() - started
+    return count / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--versions", type=int, default=100)
+    parser.add_argument("--batch", type=int, default=1000, help="messages dispatched before waiting for them")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per runtime; the best one is reported")
+    args = parser.parse_args()
+
+    payload = modrinth_payload(args.versions)
+    print(f"{args.messages} messages, Modrinth payload of {args.versions} versions ({len(payload) / 1024:.0f} KiB)")
+    for label, enabled in (("default", False), ("fast", True)):
+        active = runtime.enable_fast_runtime(enabled)
+        throughput = max(runtime.run(message_throughput(args.messages, args.batch)) for _ in range(args.repeat))
+        parse_ms = parse_time(payload) * 1000
+        print(f"{label:<8} {active}  on_message {throughput:>10,.0f} messages/sec  modpack parse {parse_ms:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
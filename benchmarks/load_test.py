@@ -0,0 +1,200 @@
+"""
+Whole-bot load test against the offline Discord simulator.
+
+Starts ``benchmarks.discord_sim`` with synthetic guilds and runs the real bot
+(``bot.py`` and every cog, a throwaway database, no metrics server) against it.
+It then replays member chatter, prefix commands and slash commands at a fixed
+rate while the background jobs run. The report covers startup, REST calls per
+tick, 429s per route and command latency per cog (from the message or
+interaction being sent to the bot's reply or callback).
+
+The Minecraft status and Modrinth results are seeded into the shared cache,
+so the jobs never leave the machine. ``/status`` probes the local Minecraft
+ping stand-in from ``benchmarks.minecraft_sim``, where a few connections stall.
+
+    python -m benchmarks.load_test [--guilds 5000] [--duration 60] [--rate 50] [--job-interval 20]
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+
+import bot as bot_module
+from benchmarks.discord_sim import COMMAND_CHANNELS, FakeDiscord
+from benchmarks.fast_runtime import modrinth_payload
+from benchmarks.minecraft_sim import FakeMinecraftServer
+
+# Replaced with the address of the local Minecraft stand-in.
+STATUS_SERVER = "{server}"
+# (command, prefix arguments, slash options)
+COMMANDS = [
+    ("help", "", []),
+    ("ping", "", []),
+    ("invite", "", []),
+    ("server", "", []),
+    ("calculate", "2*(3+4)", [{"name": "expression", "type": 3, "value": "2*(3+4)"}]),
+    ("userinfo", "", []),
+    ("status", STATUS_SERVER, [{"name": "server_ip", "type": 3, "value": STATUS_SERVER}]),
+    ("test", "", []),
+]
+CHATTER = ["lol", "anyone on tonight?", "gg", "what version are we on", "brb"]
+SEED_TTL = 24 * 3600.0
+
+
+def percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def seed_offline_results(bot: bot_module.DiscordBot) -> None:
+    async def status():
+        return {"online": True, "players": "12/100", "latency": 25, "version": "1.20.1",
+                "motd": "Ventra (simulated)", "checked_at": "2024-01-01 00:00:00"}
+
+    async def versions():
+        return json.loads(modrinth_payload(5))
+
+    await bot.shared_cache.fetch("mcstatus:ventra.dev", SEED_TTL, status)
+    await bot.shared_cache.fetch("modrinth:versions", SEED_TTL, versions)
+
+
+async def replay(sim: FakeDiscord, prefix: str, status_server: str, duration: float, rate: float,
+                 command_ratio: float, slash_ratio: float) -> None:
+    rng = random.Random(0)
+    guilds = list(sim.guilds.values())
+    started = time.monotonic()
+    for index in range(int(duration * rate)):
+        delay = started + index / rate - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        guild = rng.choice(guilds)
+        guild_id = int(guild["id"])
+        channel_id = int(guild["channels"][rng.choice(COMMAND_CHANNELS)]["id"])
+        author = dict(rng.choice(guild["members"][:-1])["user"], bot=False)
+        if rng.random() >= command_ratio:
+            await sim.dispatch_message(guild_id, channel_id, author, rng.choice(CHATTER))
+            continue
+
+        name, arguments, options = rng.choice(COMMANDS)
+        arguments = arguments.replace(STATUS_SERVER, status_server)
+        options = [dict(option, value=option["value"].replace(STATUS_SERVER, status_server)) for option in options]
+        if rng.random() < slash_ratio:
+            await sim.dispatch_interaction(guild_id, channel_id, author, name, options, tag=f"{name}/slash")
+        else:
+            content = f"{prefix}{name} {arguments}".rstrip()
+            await sim.dispatch_message(guild_id, channel_id, author, content, tag=f"{name}/prefix")
+
+
+def report_ticks(sim: FakeDiscord, since: float, until: float, tick: float) -> None:
+    calls = [call for call in sim.calls if since <= call.at < until]
+    per_tick = collections.Counter(int((call.at - since) / tick) for call in calls)
+    counts = [per_tick.get(index, 0) for index in range(max(1, int((until - since) / tick)))]
+    print(f"\nREST calls: {len(calls)} during the run, per {tick:g}s tick "
+          f"mean {sum(counts) / len(counts):.1f}  p95 {percentile(counts, 0.95)}  max {max(counts)}")
+
+    routes = collections.Counter((call.method, call.route) for call in calls)
+    limited = collections.Counter((call.method, call.route, call.scope) for call in calls if call.status == 429)
+    print(f"{'route':<62} {'calls':>7} {'429s':>6}")
+    for (method, route), count in routes.most_common():
+        rejected = sum(n for (m, r, _), n in limited.items() if (m, r) == (method, route))
+        print(f"{method + ' ' + route:<62} {count:>7} {rejected:>6}")
+    global_limited = sum(n for (_, _, scope), n in limited.items() if scope == "global")
+    print(f"429s: {sum(limited.values())} ({global_limited} global)")
+
+
+def report_latency(sim: FakeDiscord, bot: bot_module.DiscordBot) -> None:
+    by_cog = collections.defaultdict(list)
+    unanswered = collections.Counter()
+    missing = sim.unanswered()
+    for name, _, _ in COMMANDS:
+        command = bot.get_command(name)
+        cog = command.cog_name if command is not None else "?"
+        for transport in ("prefix", "slash"):
+            tag = f"{name}/{transport}"
+            by_cog[(cog, transport)].extend(sim.latencies.get(tag, []))
+            unanswered[(cog, transport)] += missing.get(tag, 0)
+
+    print(f"\n{'cog':<12} {'via':<7} {'count':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'unanswered':>11}")
+    for (cog, transport), latencies in sorted(by_cog.items()):
+        if not latencies and not unanswered[(cog, transport)]:
+            continue
+        cells = [f"{percentile(latencies, q) * 1000:>6.1f}ms" for q in (0.5, 0.95, 0.99)] if latencies else ["-".rjust(8)] * 3
+        worst = f"{max(latencies) * 1000:>6.1f}ms" if latencies else "-".rjust(8)
+        print(f"{cog:<12} {transport:<7} {len(latencies):>6} {' '.join(cells)} {worst} {unanswered[(cog, transport)]:>11}")
+
+
+def report_jobs(bot: bot_module.DiscordBot) -> None:
+    print()
+    for job in bot.scheduler.jobs.values():
+        last = f"{job.last_duration:.2f}s" if job.last_duration is not None else "-"
+        print(f"job {job.name:<26} every {job.interval:g}s  runs {job.runs}  last {last}  skipped ticks {job.skipped}")
+
+
+async def run(args: argparse.Namespace) -> None:
+    logging.getLogger("discord").setLevel(logging.ERROR)
+    sim = FakeDiscord(args.guilds, args.members, args.rest_latency)
+    await sim.start()
+    sim.install()
+    minecraft = FakeMinecraftServer(slow_ratio=args.slow_probes)
+    status_server = f"127.0.0.1:{await minecraft.start()}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bot_module.config["database"] = os.path.join(tmp, "load_test.db")
+        bot_module.config["metrics"] = dict(bot_module.config.get("metrics", {}), enabled=False)
+        bot = bot_module.create_bot()
+        await seed_offline_results(bot)
+
+        print(f"{args.guilds} guilds, {args.rate:g} messages/sec for {args.duration:g}s "
+              f"({args.command_ratio:.0%} commands, {args.slash_ratio:.0%} of them slash), "
+              f"{args.rest_latency * 1000:g}ms REST latency")
+        async with bot:
+            started = time.monotonic()
+            # login() runs setup_hook, so the cogs' jobs exist before the first tick.
+            await bot.login("sim")
+            if args.job_interval:
+                for job in bot.scheduler.jobs.values():
+                    job.interval = args.job_interval
+            connection = asyncio.create_task(bot.connect())
+            await bot.wait_until_ready()
+            ready = time.monotonic()
+            print(f"ready after {ready - started:.2f}s, {len(sim.calls)} REST calls during startup")
+
+            await replay(sim, bot.config["prefix"], status_server, args.duration, args.rate, args.command_ratio, args.slash_ratio)
+            await asyncio.sleep(args.drain)
+            finished = time.monotonic()
+
+            report_ticks(sim, ready, finished, args.tick)
+            report_latency(sim, bot)
+            report_jobs(bot)
+            connection.cancel()
+
+    await sim.stop()
+    await minecraft.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--guilds", type=int, default=5000)
+    parser.add_argument("--members", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--rate", type=float, default=50.0, help="messages and interactions per second")
+    parser.add_argument("--command-ratio", type=float, default=0.2)
+    parser.add_argument("--slash-ratio", type=float, default=0.5)
+    parser.add_argument("--rest-latency", type=float, default=0.03, help="seconds added to every REST call")
+    parser.add_argument("--job-interval", type=float, default=None, help="override every job's interval")
+    parser.add_argument("--slow-probes", type=float, default=0.05, help="share of stalled Minecraft status probes")
+    parser.add_argument("--tick", type=float, default=1.0)
+    parser.add_argument("--drain", type=float, default=5.0, help="seconds to wait for replies after the replay")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Synthetic message throughput of DiscordBot.on_message.
+
+Builds realistic discord.Message objects (mostly chatter, a few bot messages,
+mentions and prefix commands) and feeds them to on_message, comparing the
+prefix pre-filter against the previous behaviour of handing every non-bot
+message to process_commands, and checking that per-guild prefixes served from
+the in-memory cache don't slow the pre-filter down.
+
+    python -m benchmarks.message_throughput [--messages 200000] [--command-ratio 0.01]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+import discord
+
+import bot as bot_module
+from benchmarks.payloads import guild_payload, message_payload, user_payload
+
+CHATTER = [
+    "anyone on the server tonight?",
+    "lol",
+    "the new modpack update broke my world",
+    "gg",
+    "what version are we on",
+    "https://example.com/some/screenshot.png",
+    "brb",
+]
+
+
+GUILDS = 50
+
+
+def build_messages(bot: bot_module.DiscordBot, count: int, command_ratio: float, guilds: int = GUILDS) -> list:
+    state = bot._connection
+
+    rng = random.Random(0)
+    messages = []
+    for index in range(count):
+        guild_index = index % guilds
+        guild_id = int(guild_payload(guild_index, 0)["id"])
+        prefix = bot.guild_prefixes.get(guild_id, bot.config["prefix"])
+        roll = rng.random()
+        bot_author = False
+        if roll < command_ratio:
+            content = f"{prefix}noop"
+        elif roll < command_ratio + 0.01:
+            content = f"<@{bot.user.id}> hello there"
+        elif roll < command_ratio + 0.06:
+            content, bot_author = "Automated announcement", True
+        else:
+            content = rng.choice(CHATTER)
+
+        data = message_payload(guild_index, index, 20, content=content, bot_author=bot_author)
+        channel = state._get_guild(int(data["guild_id"])).get_channel(int(data["channel_id"]))
+        messages.append(discord.Message(state=state, channel=channel, data=data))
+    return messages
+
+
+async def run(count: int, command_ratio: float) -> None:
+    bot = bot_module.DiscordBot()
+    state = bot._connection
+    state.user = discord.ClientUser(state=state, data=user_payload(1))
+    bot.refresh_prefix_filter()
+
+    invoked = 0
+
+    @bot.command()
+    async def noop(ctx):
+        nonlocal invoked
+        invoked += 1
+
+    async def unfiltered(message: discord.Message) -> None:
+        # on_message before the pre-filter was added.
+        if message.author == bot.user or message.author.bot:
+            return
+        await bot.process_commands(message)
+
+    for index in range(GUILDS):
+        state._add_guild_from_data(guild_payload(index, 20))
+    messages = build_messages(bot, count, command_ratio)
+
+    # Half of the guilds get their own prefix, served from the in-memory cache.
+    for index in range(0, GUILDS, 2):
+        bot.guild_prefixes[int(guild_payload(index, 0)["id"])] = "?"
+    bot.refresh_prefix_filter()
+    guild_prefix_messages = build_messages(bot, count, command_ratio)
+    guild_prefixes = dict(bot.guild_prefixes)
+
+    print(f"{count} messages, {command_ratio:.1%} commands")
+
+    runs = (
+        ("process_commands for every message", unfiltered, messages, {}),
+        ("pre-filtered on_message", bot.on_message, messages, {}),
+        ("pre-filtered, per-guild prefixes", bot.on_message, guild_prefix_messages, guild_prefixes),
+    )
+    # Entering the client binds it to the running loop so events can be dispatched.
+    async with bot:
+        for label, handler, messages, prefixes in runs:
+            bot.guild_prefixes = prefixes
+            bot.refresh_prefix_filter()
+            invoked = 0
+            started = time.perf_counter()
+            for message in messages:
+                await handler(message)
+            elapsed = time.perf_counter() - started
+            # Let the dispatched on_command/on_command_completion tasks finish.
+            await asyncio.sleep(0)
+            print(f"{label:<36} {count / elapsed:>12,.0f} messages/sec ({invoked} commands invoked)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200_000)
+    parser.add_argument("--command-ratio", type=float, default=0.01)
+    args = parser.parse_args()
+    asyncio.run(run(args.messages, args.command_ratio))
+
+
+if __name__ == "__main__":
+    main()
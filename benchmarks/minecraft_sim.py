@@ -0,0 +1,140 @@
+"""
+Local stand-in for the status ("server list ping") protocol of a Minecraft
+Java server.
+
+``FakeMinecraftServer`` answers the handshake, status request and ping like a
+real server. Before each status response it waits a random ``fast`` delay,
+or ``slow`` seconds for a ``slow_ratio`` share of connections (the tail a
+real server shows from packet loss or a busy main thread). With
+``blackhole=True`` it accepts connections and never answers, like an address
+whose route breaks after the TCP handshake.
+
+The ``(host, port)`` of every handshake is kept in ``handshakes``. With
+``expect_host`` set, a handshake naming any other host is dropped without an
+answer, like a TCPShield or BungeeCord forced-hosts proxy that routes on the
+name the client connected with.
+"""
+
+import asyncio
+import json
+import random
+from typing import List, Optional, Tuple
+
+STATUS = {
+    "version": {"name": "1.20.1", "protocol": 763},
+    "players": {
+        "max": 100,
+        "online": 12,
+        "sample": [{"name": f"player{index}", "id": f"00000000-0000-0000-0000-{index:012d}"} for index in range(12)],
+    },
+    "description": {"text": "Ventra (simulated)"},
+}
+
+
+def varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+async def read_varint(reader: asyncio.StreamReader) -> int:
+    value = 0
+    for shift in range(0, 35, 7):
+        byte = (await reader.readexactly(1))[0]
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value
+    raise ValueError("VarInt is too big")
+
+
+def packet(body: bytes) -> bytes:
+    return varint(len(body)) + body
+
+
+def unpack_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    value = 0
+    for shift in range(0, 35, 7):
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+    raise ValueError("VarInt is too big")
+
+
+def parse_handshake(body: bytes) -> Tuple[str, int]:
+    """Returns the server ``(host, port)`` a handshake packet body names."""
+    _, offset = unpack_varint(body, 1)  # Packet ID, then protocol version.
+    length, offset = unpack_varint(body, offset)
+    host = body[offset:offset + length].decode()
+    port = int.from_bytes(body[offset + length:offset + length + 2], "big")
+    return host, port
+
+
+class FakeMinecraftServer:
+    def __init__(self, fast: Tuple[float, float] = (0.002, 0.01), slow: float = 1.5,
+                 slow_ratio: float = 0.0, blackhole: bool = False, seed: Optional[int] = 0,
+                 expect_host: Optional[str] = None) -> None:
+        self.fast = fast
+        self.slow = slow
+        self.slow_ratio = slow_ratio
+        self.blackhole = blackhole
+        self.expect_host = expect_host
+        self.handshakes: List[Tuple[str, int]] = []
+        self.rng = random.Random(seed)
+        self.connections = 0
+        self.handlers = set()
+        self.closing = asyncio.Event()
+        self.server: Optional[asyncio.AbstractServer] = None
+        status = json.dumps(STATUS).encode()
+        self.response = packet(varint(0) + varint(len(status)) + status)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        self.server = await asyncio.start_server(self.handle, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            # Let held (blackholed or stalled) connections finish instead of
+            # being cancelled at shutdown, which asyncio's stream server logs as an error.
+            self.closing.set()
+            await asyncio.gather(*self.handlers)
+            await self.server.wait_closed()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self.handlers.add(asyncio.current_task())
+        try:
+            if self.blackhole:
+                await self.closing.wait()
+                return
+            delay = self.slow if self.rng.random() < self.slow_ratio else self.rng.uniform(*self.fast)
+            while True:
+                body = await reader.readexactly(await read_varint(reader))
+                packet_id = body[0]
+                if packet_id == 0 and len(body) > 1:
+                    host, port = parse_handshake(body)
+                    self.handshakes.append((host, port))
+                    if self.expect_host is not None and host != self.expect_host:
+                        # No backend for that name: close without answering.
+                        return
+                elif packet_id == 0:
+                    # Status request (same ID as the handshake, but without a payload).
+                    await asyncio.sleep(delay)
+                    writer.write(self.response)
+                elif packet_id == 1:
+                    # Ping: echo the token back.
+                    writer.write(packet(body))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.handlers.discard(asyncio.current_task())
+            writer.close()
@@ -0,0 +1,69 @@
+"""
+Synthetic Discord gateway payloads shared by the benchmarks.
+"""
+
+BASE_ID = 10**17
+# Guild ids are this far apart so consecutive guilds land on consecutive shards
+# (a guild's shard is ``(guild_id >> 22) % shard_count``).
+GUILD_ID_STEP = 1 << 22
+
+
+def user_payload(user_id: int) -> dict:
+    return {"id": str(user_id), "username": f"user{user_id}", "discriminator": "0", "global_name": None, "avatar": None}
+
+
+def guild_payload(index: int, members: int) -> dict:
+    guild_id = BASE_ID + index * GUILD_ID_STEP
+    return {
+        "id": str(guild_id),
+        "name": f"Guild {index}",
+        "owner_id": str(guild_id + 1),
+        "member_count": members,
+        "features": [],
+        "roles": [
+            {"id": str(guild_id + role), "name": f"role-{role}", "permissions": "0", "position": role,
+             "color": 0, "hoist": False, "managed": False, "mentionable": False}
+            for role in range(10)
+        ],
+        "channels": [
+            {"id": str(guild_id + 100 + channel), "type": 0, "name": f"channel-{channel}", "position": channel,
+             "permission_overwrites": [], "nsfw": False, "parent_id": None}
+            for channel in range(8)
+        ],
+        "members": [
+            {"user": user_payload(guild_id + 500 + member), "roles": [], "joined_at": "2024-01-01T00:00:00+00:00",
+             "deaf": False, "mute": False, "flags": 0}
+            for member in range(members)
+        ],
+        "voice_states": [],
+        "presences": [],
+        "threads": [],
+        "stickers": [],
+        "emojis": [],
+    }
+
+
+def message_payload(guild_index: int, message_index: int, members: int,
+                    content: str = "just chatting about the server " * 3, bot_author: bool = False) -> dict:
+    guild_id = BASE_ID + guild_index * GUILD_ID_STEP
+    author_id = guild_id + 500 + (message_index % max(members, 1))
+    author = user_payload(author_id)
+    author["bot"] = bot_author
+    return {
+        "id": str(guild_id * 10 + message_index),
+        "channel_id": str(guild_id + 100 + message_index % 8),
+        "guild_id": str(guild_id),
+        "author": author,
+        "member": {"roles": [], "joined_at": "2024-01-01T00:00:00+00:00", "deaf": False, "mute": False, "flags": 0},
+        "content": content,
+        "timestamp": "2024-01-01T00:00:00+00:00",
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [],
+        "pinned": False,
+        "type": 0,
+    }
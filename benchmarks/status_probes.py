@@ -0,0 +1,119 @@
+"""
+Tail latency of Minecraft status probes against the local ping stand-in.
+
+Compares the previous probe path (mcstatus lookup + status with its default
+timeouts and retries) with utils.probes.StatusProber, with and without
+hedging, in two scenarios:
+
+- slow tail: one server where --slow-ratio of connections stall for --slow seconds;
+- dead IPv6: a dual-stack server whose IPv6 address accepts connections but
+  never answers. The previous path sticks to the first (IPv6) address; the
+  prober races both families;
+- forced host: a server behind a name-routing proxy that drops handshakes
+  not naming ``localhost``. Probing ``localhost:port`` must keep that name in
+  the handshake while connecting to the resolved IP.
+
+    python -m benchmarks.status_probes [--probes 500] [--concurrency 10] [--slow-ratio 0.05] [--slow 1.5]
+"""
+
+import argparse
+import asyncio
+import time
+
+from mcstatus import JavaServer
+
+from benchmarks.minecraft_sim import FakeMinecraftServer
+from utils.metrics import MetricsRegistry
+from utils.probes import StatusProber
+
+
+def percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def measure(label: str, probe, count: int, concurrency: int, attempts=None) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    failures = 0
+
+    async def one() -> None:
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await probe()
+            except Exception:
+                failures += 1
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one() for _ in range(count)))
+    cells = "  ".join(f"{name} {percentile(latencies, q) * 1000:>7.1f}ms" for name, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)))
+    extra = f"  {attempts() / count:.2f} attempts/probe" if attempts is not None else ""
+    print(f"{label:<26} {count:>5} probes  {failures:>4} failed  {cells}  max {max(latencies) * 1000:>7.1f}ms{extra}")
+
+
+def prober_attempts(metrics: MetricsRegistry):
+    return lambda: sum(metrics.counters("ventra_probe_attempts_total").values())
+
+
+async def previous_path(target: str) -> None:
+    server = await JavaServer.async_lookup(target)
+    await server.async_status()
+
+
+async def run(args: argparse.Namespace) -> None:
+    server = FakeMinecraftServer(slow=args.slow, slow_ratio=args.slow_ratio)
+    port = await server.start("127.0.0.1")
+    target = f"127.0.0.1:{port}"
+
+    print(f"slow tail: {args.slow_ratio:.0%} of connections stall for {args.slow:g}s, concurrency {args.concurrency}")
+    await measure("previous path", lambda: previous_path(target), args.probes, args.concurrency)
+    for label, hedge in (("deadline only", False), ("deadline + hedge", True)):
+        metrics = MetricsRegistry()
+        prober = StatusProber(metrics, args.deadline, hedge=hedge)
+        await measure(label, lambda: prober.status(target), args.probes, args.concurrency, prober_attempts(metrics))
+
+    # The same port on ::1 goes to a server that never answers.
+    fast = FakeMinecraftServer()
+    fast_port = await fast.start("127.0.0.1")
+    dead = FakeMinecraftServer(blackhole=True)
+    await dead.start("::1", fast_port)
+    addresses = [("::1", fast_port), ("127.0.0.1", fast_port)]
+    # The previous path waits out mcstatus's timeouts on every probe here, so fewer are run.
+    count = min(args.probes, 50)
+
+    print(f"\ndead IPv6: {addresses[0][0]} accepts but never answers, {addresses[1][0]} is healthy")
+    await measure("previous path (IPv6 first)", lambda: JavaServer("::1", fast_port).async_status(), count, args.concurrency)
+    metrics = MetricsRegistry()
+    prober = StatusProber(metrics, args.deadline)
+    await measure("happy eyeballs", lambda: prober.race(addresses), count, args.concurrency, prober_attempts(metrics))
+
+    forced = FakeMinecraftServer(expect_host="localhost")
+    forced_port = await forced.start("127.0.0.1")
+    count = min(args.probes, 50)
+    print(f"\nforced host: 127.0.0.1:{forced_port} only answers handshakes naming localhost")
+    metrics = MetricsRegistry()
+    prober = StatusProber(metrics, args.deadline)
+    await measure("resolved hostname", lambda: prober.status(f"localhost:{forced_port}"), count, args.concurrency,
+                  prober_attempts(metrics))
+    wrong = sum(host != "localhost" for host, _ in forced.handshakes)
+    print(f"handshakes naming another host: {wrong} of {len(forced.handshakes)}")
+
+    for stub in (server, dead, fast, forced):
+        await stub.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--probes", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--slow-ratio", type=float, default=0.05)
+    parser.add_argument("--slow", type=float, default=1.5)
+    parser.add_argument("--deadline", type=float, default=2.5)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,39 @@
+import asyncio
+import hashlib
+import io
 import json
+import logging
 import os
+import pathlib
 import platform
 import sys
 import random
+import time
 import certifi
 
 # Fix SSL context for macOS - MUST be done before importing discord/aiohttp
 os.environ["SSL_CERT_FILE"] = certifi.where()
 
 import discord
+from discord import app_commands
 from discord.ext import commands, tasks
 from discord.ext.commands import Context
 from dotenv import load_dotenv
 
+from utils.cache_policy import client_options, resolve_cache_policy
+from utils.database import Database
+from utils.logger import setup_logging
+from utils.loop_monitor import LoopMonitor
+from utils.memory import MemoryTracker, cache_counts, live_object_counts
+from utils.metrics import MetricsRegistry, start_metrics_server
+from utils.profiler import Profiler
+from utils.ratelimit import RateLimiter
+from utils import runtime
+from utils.scheduler import Scheduler
+from utils.shared_cache import SharedCache
+
+COGS_DIR = pathlib.Path(__file__).resolve().parent / "cogs"
+
 if not os.path.isfile(f"{os.path.realpath(os.path.dirname(__file__))}/config.json"):
     sys.exit("'config.json' not found! Please add it and try again.")
 else:
@@ -22,52 +43,332 @@ else:
 # Load environment variables from .env file
 load_dotenv()
 
-class DiscordBot(commands.Bot):
-    def __init__(self) -> None:
-        intents = discord.Intents.default()
-        intents.message_content = True
-        
+# Sharding has to be decided before the class is created, since it changes the base class.
+BotBase = commands.AutoShardedBot if config.get("sharding", {}).get("enabled") else commands.Bot
+
+logger = logging.getLogger("ventra")
+command_logger = logging.getLogger("ventra.commands")
+extension_logger = logging.getLogger("ventra.extensions")
+
+def cooldown_embed(retry_after: float) -> discord.Embed:
+    """
+    The "please slow down" embed shown when a command is on cooldown or rate limited.
+    """
+    minutes, seconds = divmod(retry_after, 60)
+    hours, minutes = divmod(minutes, 60)
+    hours = hours % 24
+    return discord.Embed(
+        description=f"**Please slow down** - You can use this command again in {f'{round(hours)} hours' if round(hours) > 0 else ''} {f'{round(minutes)} minutes' if round(minutes) > 0 else ''} {f'{round(seconds)} seconds' if round(seconds) > 0 else ''}.",
+        color=0xE02B2B
+    )
+
+
+class VentraCommandTree(app_commands.CommandTree):
+    """
+    Command tree that timestamps every application command interaction so
+    slash-only commands can be timed the same way as prefix/hybrid commands.
+    """
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        # Autocomplete also passes through here, once per keystroke; it is neither timed nor rate limited.
+        if interaction.type is not discord.InteractionType.application_command:
+            return True
+        interaction.extras["started_at"] = time.perf_counter()
+
+        # Hybrid commands are rate limited through the bot-wide check instead.
+        command = interaction.command
+        if command is not None and not isinstance(command, commands.hybrid.HybridAppCommand):
+            cooldown = self.client.rate_limiter.check_command(
+                command.qualified_name, interaction.user.id, interaction.guild_id
+            )
+            if cooldown is not None:
+                await interaction.response.send_message(embed=cooldown_embed(cooldown.retry_after), ephemeral=True)
+                return False
+        return True
+
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError) -> None:
+        command = interaction.command
+        if command is not None and not isinstance(command, commands.hybrid.HybridAppCommand):
+            self.client.record_command(command.qualified_name, interaction.extras.get("started_at"), error)
+        await super().on_error(interaction, error)
+
+
+class DiscordBot(BotBase):
+    def __init__(self, shared_cache: SharedCache | None = None, **options) -> None:
+        """
+        Extra keyword arguments (e.g. ``shard_ids`` and ``shard_count`` from the
+        cluster launcher) are passed straight through to discord.py.
+        """
+        self.cache_policy = resolve_cache_policy(config.get("cache"))
+
         super().__init__(
-            command_prefix=commands.when_mentioned_or(config["prefix"]),
-            intents=intents,
+            command_prefix=DiscordBot.prefixes_for,
             help_command=None,
+            tree_cls=VentraCommandTree,
+            **client_options(self.cache_policy),
+            **options,
         )
         self.config = config
+        self.shared_cache = shared_cache or SharedCache()
+        self.database = Database(pathlib.Path(__file__).resolve().parent / config.get("database", "data/ventra.db"))
+        # Per-guild prefix overrides, loaded from the database at startup and written through on change.
+        self.guild_prefixes: dict[int, str] = {}
+        # Filled in by refresh_prefix_filter() once the bot user is known.
+        self.mention_prefixes: list[str] = []
+        self.command_prefixes: tuple[str, ...] | None = None
+        self.guild_command_prefixes: dict[int, tuple[str, ...]] = {}
+        self.metrics = MetricsRegistry()
+        self.metrics.describe("ventra_command_duration_seconds", "Time from invocation to completion or error.")
+        self.metrics.describe("ventra_command_errors_total", "Command errors by command and error type.")
+        self.metrics_runner = None
+        self.profiler = Profiler()
+        self.profiler_task = None
+        self.memory = MemoryTracker()
+        # Bumped whenever a cog is added or removed, so caches built from the command list know to rebuild.
+        self.command_tree_version = 0
+        self.rate_limiter = RateLimiter(config.get("ratelimits"))
+        self.scheduler = Scheduler(self, self.metrics, config.get("scheduler", {}).get("rest_concurrency", 4))
+        self.add_check(self.check_rate_limit)
+
+        monitor_config = self.config.get("loop_monitor", {})
+        self.loop_monitor = LoopMonitor(
+            self.metrics,
+            interval=monitor_config.get("interval", 0.25),
+            threshold=monitor_config.get("threshold", 0.25),
+        )
+
+    def prefixes_for(self, message: discord.Message) -> list[str]:
+        """
+        Used as ``command_prefix``: the mention forms plus the guild's prefix (or
+        the default one). Served from memory only, since it runs for every
+        command message.
+        """
+        if self.cache_policy["slash_only"]:
+            # Without the message_content intent only messages mentioning the bot carry content.
+            return self.mention_prefixes
+        guild = message.guild
+        prefix = self.guild_prefixes.get(guild.id, self.config["prefix"]) if guild else self.config["prefix"]
+        return self.mention_prefixes + [prefix]
+
+    def refresh_prefix_filter(self) -> None:
+        """
+        Precomputes everything a command message can start with (the mention
+        forms and, unless slash-only, the default or per-guild prefix) for on_message.
+        """
+        self.mention_prefixes = [f"<@{self.user.id}> ", f"<@!{self.user.id}> "]
+        mentions = (f"<@{self.user.id}>", f"<@!{self.user.id}>")
+        if self.cache_policy["slash_only"]:
+            self.command_prefixes = mentions
+            self.guild_command_prefixes = {}
+            return
+        self.command_prefixes = mentions + (self.config["prefix"],)
+        self.guild_command_prefixes = {
+            guild_id: mentions + (prefix,) for guild_id, prefix in self.guild_prefixes.items()
+        }
+
+    async def load_guild_prefixes(self) -> None:
+        rows = await self.database.execute("SELECT guild_id, prefix FROM guild_prefixes")
+        self.guild_prefixes = {guild_id: prefix for guild_id, prefix in rows}
+
+    async def set_guild_prefix(self, guild_id: int, prefix: str | None) -> None:
+        """
+        Sets (or, with ``None``, resets) a guild's prefix in memory and in the database.
+        """
+        if prefix is None:
+            self.guild_prefixes.pop(guild_id, None)
+            await self.database.execute("DELETE FROM guild_prefixes WHERE guild_id = ?", (guild_id,))
+        else:
+            self.guild_prefixes[guild_id] = prefix
+            await self.database.execute(
+                "INSERT INTO guild_prefixes (guild_id, prefix) VALUES (?, ?) "
+                "ON CONFLICT(guild_id) DO UPDATE SET prefix = excluded.prefix",
+                (guild_id, prefix)
+            )
+        self.refresh_prefix_filter()
+
+    async def add_cog(self, cog: commands.Cog, /, **kwargs) -> None:
+        await super().add_cog(cog, **kwargs)
+        self.command_tree_version += 1
+
+    async def remove_cog(self, name: str, /, **kwargs) -> commands.Cog | None:
+        cog = await super().remove_cog(name, **kwargs)
+        self.command_tree_version += 1
+        return cog
+
+    def command_tree_hash(self, guild: discord.abc.Snowflake | None = None) -> str:
+        """
+        A stable hash of the command payloads that would be synced for ``guild``
+        (or globally).
+        """
+        payload = sorted(
+            (command.to_dict(self.tree) for command in self.tree.get_commands(guild=guild)),
+            key=lambda command: (command.get("type", 1), command["name"])
+        )
+        serialized = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    async def sync_tree(self, guild: discord.abc.Snowflake | None = None) -> list:
+        """
+        Syncs the tree (globally or to ``guild``) and remembers what was synced.
+        """
+        synced = await self.tree.sync(guild=guild)
+        scope = "global" if guild is None else str(guild.id)
+        await self.database.execute(
+            "INSERT INTO command_sync (scope, hash) VALUES (?, ?) "
+            "ON CONFLICT(scope) DO UPDATE SET hash = excluded.hash",
+            (scope, self.command_tree_hash(guild))
+        )
+        return synced
+
+    async def sync_commands_if_changed(self) -> None:
+        """
+        Syncs globally and to each configured dev guild, but only where the
+        command tree changed since the last sync. Sync is heavily rate limited
+        by Discord, so unchanged deploys skip it entirely.
+        """
+        sync_config = self.config.get("auto_sync", {})
+        if not sync_config.get("enabled"):
+            return
+        # With several clusters only the one owning shard 0 syncs.
+        shard_ids = getattr(self, "shard_ids", None)
+        if shard_ids is not None and 0 not in shard_ids:
+            return
+
+        synced_hashes = dict(await self.database.execute("SELECT scope, hash FROM command_sync"))
+        targets = [None] if sync_config.get("global", True) else []
+        for guild_id in sync_config.get("dev_guilds", []):
+            guild = discord.Object(id=guild_id)
+            self.tree.copy_global_to(guild=guild)
+            targets.append(guild)
+
+        for guild in targets:
+            scope = "global" if guild is None else str(guild.id)
+            if synced_hashes.get(scope) == self.command_tree_hash(guild):
+                logger.info("Slash commands (%s) are up to date, skipping sync.", scope)
+                continue
+            try:
+                synced = await self.sync_tree(guild)
+            except discord.HTTPException as e:
+                logger.error("Failed to sync slash commands (%s): %s", scope, e)
+                continue
+            logger.info("Synced %d slash command(s) (%s).", len(synced), scope)
+
+    async def check_rate_limit(self, context: Context) -> bool:
+        """
+        Bot-wide check applying the configured rate limits to prefix and hybrid
+        commands, however they were invoked.
+        """
+        cooldown = self.rate_limiter.check_command(
+            context.command.qualified_name, context.author.id, context.guild.id if context.guild else None
+        )
+        if cooldown is not None:
+            raise cooldown
+        return True
+
+    def owns_guild(self, guild_id: int | None) -> bool:
+        """
+        Whether events for ``guild_id`` (``None`` for DMs, which go to shard 0)
+        reach this process. Decided from the guild's shard rather than the
+        guild cache, so cogs can use it before the guilds have arrived; once
+        ready it agrees with ``get_guild(guild_id) is not None``.
+        """
+        shard_ids = getattr(self, "shard_ids", None)
+        if shard_ids is None and self.shard_id is not None:
+            shard_ids = [self.shard_id]
+        if shard_ids is None:
+            return True
+        return ((guild_id or 0) >> 22) % self.shard_count in shard_ids
+
+    def iter_active_guilds(self):
+        """
+        Yields the guilds background tasks should work on: every guild this
+        process handles, skipping those whose shard is currently disconnected.
+        """
+        shards = getattr(self, "shards", None)
+        for guild in self.guilds:
+            if shards is not None:
+                shard = shards.get(guild.shard_id)
+                if shard is None or shard.is_closed():
+                    continue
+            yield guild
+
+    def record_command(self, name: str, started_at: float | None, error: Exception | None = None) -> None:
+        """
+        Records the duration of a command invocation and, if it failed, the error type.
+        """
+        labels = (("command", name),)
+        if started_at is not None:
+            self.metrics.histogram("ventra_command_duration_seconds", labels).observe(time.perf_counter() - started_at)
+        if error is not None:
+            error = getattr(error, "original", error)
+            self.metrics.inc("ventra_command_errors_total", labels + (("error", type(error).__name__),))
 
     async def setup_hook(self) -> None:
         """
         This will be executed when the bot starts, before the cache is ready.
         """
-        print(f"Logged in as {self.user.name}")
-        print(f"discord.py API version: {discord.__version__}")
-        print(f"Python version: {platform.python_version()}")
-        print(f"Running on: {platform.system()} {platform.release()} ({os.name})")
-        print("-------------------")
+        logger.info("Logged in as %s", self.user.name)
+        logger.info("discord.py API version: %s", discord.__version__)
+        logger.info("Python version: %s", platform.python_version())
+        logger.info("Running on: %s %s (%s)", platform.system(), platform.release(), os.name)
+
+        await self.database.connect()
+        await self.load_guild_prefixes()
+        self.refresh_prefix_filter()
         
+        if self.config.get("loop_monitor", {}).get("enabled", True):
+            self.loop_monitor.start()
+
         await self.load_extensions()
+        await self.sync_commands_if_changed()
+
+        metrics_config = self.config.get("metrics", {})
+        if metrics_config.get("enabled"):
+            host = metrics_config.get("host", "127.0.0.1")
+            port = metrics_config.get("port", 9108)
+            self.metrics_runner = await start_metrics_server(self.metrics, host, port)
+            logger.info("Serving metrics on http://%s:%s/metrics", host, port)
+
+    async def close(self) -> None:
+        self.loop_monitor.stop()
+        self.scheduler.stop()
+        if self.metrics_runner is not None:
+            await self.metrics_runner.cleanup()
+        await super().close()
+        await self.database.close()
 
     async def load_extensions(self) -> None:
         """
-        Loads all extensions from the cogs directory.
+        Loads all extensions from the cogs directory next to this file, concurrently.
+        """
+        started = time.perf_counter()
+        extension_names = sorted(f"cogs.{path.stem}" for path in COGS_DIR.glob("*.py"))
+        await asyncio.gather(*(self.load_extension_timed(name) for name in extension_names))
+        extension_logger.info(
+            "Loaded %d extension(s) in %.1fms", len(self.extensions), (time.perf_counter() - started) * 1000
+        )
+
+    async def load_extension_timed(self, extension_name: str) -> None:
+        """
+        Loads a single extension and logs how long its import and setup took.
         """
-        for filename in os.listdir("./cogs"):
-            if filename.endswith(".py"):
-                extension_name = f"cogs.{filename[:-3]}"
-                try:
-                    await self.load_extension(extension_name)
-                    print(f"Loaded extension: {extension_name}")
-                except Exception as e:
-                    print(f"Failed to load extension {extension_name}.")
-                    print(f"{type(e).__name__}: {e}")
+        started = time.perf_counter()
+        try:
+            await self.load_extension(extension_name)
+            extension_logger.info(
+                "Loaded extension: %s (%.1fms)", extension_name, (time.perf_counter() - started) * 1000
+            )
+        except Exception as e:
+            extension_logger.error("Failed to load extension %s. %s: %s", extension_name, type(e).__name__, e)
 
     async def on_ready(self) -> None:
         """
         This code runs when the bot is fully ready and the cache is populated.
         """
-        print(f"Bot is ready! Logged in as {self.user}")
-        print("-------------------")
+        logger.info("Bot is ready! Logged in as %s", self.user)
         
-        await self.change_presence(activity=discord.Game(name=f"Type {self.config['prefix']}help"))
+        prefix = "/" if self.cache_policy["slash_only"] else self.config["prefix"]
+        await self.change_presence(activity=discord.Game(name=f"Type {prefix}help"))
 
     async def on_message(self, message: discord.Message) -> None:
         """
@@ -76,34 +377,76 @@ class DiscordBot(commands.Bot):
         """
         if message.author == self.user or message.author.bot:
             return
+
+        # Fast path: most messages aren't commands, so reject them before a Context is built.
+        if self.command_prefixes is not None:
+            prefixes = self.command_prefixes
+            if self.guild_command_prefixes and message.guild is not None:
+                prefixes = self.guild_command_prefixes.get(message.guild.id, prefixes)
+            if not message.content.startswith(prefixes):
+                return
             
         await self.process_commands(message)
 
+    async def invoke(self, context: Context, /) -> None:
+        """
+        Stamps the start time before invoking the command. on_command runs as a
+        separate task, so stamping it there would miss everything the command
+        does before its first await.
+        """
+        context.started_at = time.perf_counter()
+        await super().invoke(context)
+
+    @staticmethod
+    def command_started_at(context: Context) -> float | None:
+        """
+        The start time of a command: stamped by invoke for prefix commands, or by
+        the command tree's interaction_check for hybrid commands used as slash commands.
+        """
+        started_at = getattr(context, "started_at", None)
+        if started_at is None and context.interaction is not None:
+            started_at = context.interaction.extras.get("started_at")
+        return started_at
+
+    async def on_app_command_completion(self, interaction: discord.Interaction, command) -> None:
+        """
+        The code in this event is executed every time an application command has been *successfully* executed.
+        Hybrid commands are already timed through on_command_completion.
+        """
+        if isinstance(command, commands.hybrid.HybridAppCommand):
+            return
+        self.record_command(command.qualified_name, interaction.extras.get("started_at"))
+
     async def on_command_completion(self, context: Context) -> None:
         """
         The code in this event is executed every time a normal command has been *successfully* executed.
         """
+        self.record_command(context.command.qualified_name, self.command_started_at(context))
+        if not command_logger.isEnabledFor(logging.INFO):
+            return
         full_command_name = context.command.qualified_name
         split = full_command_name.split(" ")
         executed_command = str(split[0])
         if context.guild:
-            location = f"{context.guild.name} (ID: {context.guild.id})"
+            command_logger.info(
+                "Executed %s command in %s (ID: %s) by %s (ID: %s)",
+                executed_command, context.guild.name, context.guild.id, context.author, context.author.id
+            )
         else:
-            location = "Direct Message"
-        print(f"Executed {executed_command} command in {location} by {context.author} (ID: {context.author.id})")
+            command_logger.info(
+                "Executed %s command in Direct Message by %s (ID: %s)",
+                executed_command, context.author, context.author.id
+            )
 
     async def on_command_error(self, context: Context, error) -> None:
         """
         The code in this event is executed every time a valid command catches an error.
         """
+        if context.command is not None:
+            self.record_command(context.command.qualified_name, self.command_started_at(context), error)
+
         if isinstance(error, commands.CommandOnCooldown):
-            minutes, seconds = divmod(error.retry_after, 60)
-            hours, minutes = divmod(minutes, 60)
-            hours = hours % 24
-            embed = discord.Embed(
-                description=f"**Please slow down** - You can use this command again in {f'{round(hours)} hours' if round(hours) > 0 else ''} {f'{round(minutes)} minutes' if round(minutes) > 0 else ''} {f'{round(seconds)} seconds' if round(seconds) > 0 else ''}.",
-                color=0xE02B2B
-            )
+            embed = cooldown_embed(error.retry_after)
             await context.send(embed=embed)
         elif isinstance(error, commands.NotOwner):
             embed = discord.Embed(
@@ -115,7 +458,10 @@ class DiscordBot(commands.Bot):
                 guild_info = f"{context.guild.name} (ID: {context.guild.id})"
             else:
                 guild_info = "Direct Message"
-            print(f"{context.author} (ID: {context.author.id}) tried to execute an owner only command in {guild_info}, but the user is not an owner of the bot.")
+            command_logger.warning(
+                "%s (ID: %s) tried to execute an owner only command in %s, but the user is not an owner of the bot.",
+                context.author, context.author.id, guild_info
+            )
         elif isinstance(error, commands.MissingPermissions):
             embed = discord.Embed(
                 description="You are missing the permission(s) `" + ", ".join(error.missing_permissions) + "` to execute this command!",
@@ -145,8 +491,11 @@ class DiscordBot(commands.Bot):
             raise error
 
 
-if __name__ == "__main__":
-    bot = DiscordBot()
+def create_bot(**options) -> DiscordBot:
+    """
+    Creates the bot and registers the owner-only commands on it.
+    """
+    bot = DiscordBot(**options)
     
     @bot.command()
     @commands.is_owner()
@@ -159,7 +508,7 @@ if __name__ == "__main__":
         !sync clear  -> Clears commands in the current guild
         """
         if scope == "global":
-            synced = await bot.tree.sync()
+            synced = await bot.sync_tree()
             await ctx.send(f"Synced {len(synced)} slash commands globally. This may take up to an hour to propagate.")
             return
 
@@ -168,7 +517,7 @@ if __name__ == "__main__":
                 await ctx.send("This command can only be used in a server.")
                 return
             bot.tree.clear_commands(guild=ctx.guild)
-            await bot.tree.sync(guild=ctx.guild)
+            await bot.sync_tree(guild=ctx.guild)
             await ctx.send("Cleared guild commands.")
             return
 
@@ -178,12 +527,180 @@ if __name__ == "__main__":
             return
             
         bot.tree.copy_global_to(guild=ctx.guild)
-        synced = await bot.tree.sync(guild=ctx.guild)
+        synced = await bot.sync_tree(guild=ctx.guild)
         await ctx.send(f"Synced {len(synced)} command(s) to this guild immediately!")
 
+    async def send_profile(channel) -> None:
+        filename, data = bot.profiler.stop()
+        bot.profiler_task = None
+        await channel.send(
+            f"Profiler stopped after {bot.profiler.samples} samples." if bot.profiler.samples else "Profiler stopped.",
+            file=discord.File(io.BytesIO(data), filename=filename)
+        )
+
+    @bot.group(invoke_without_command=True)
+    @commands.is_owner()
+    async def profile(ctx):
+        """
+        Profiles the running bot without a restart.
+        Usage:
+        !profile start [seconds] [collapsed|pstats] -> Starts profiling, stops automatically after `seconds` (default 30)
+        !profile stop                               -> Stops early and attaches the profile
+        """
+        state = "running" if bot.profiler.running else "stopped"
+        await ctx.send(f"Profiler is {state}. Use `profile start [seconds] [collapsed|pstats]` or `profile stop`.")
+
+    @profile.command(name="start")
+    @commands.is_owner()
+    async def profile_start(ctx, seconds: float = 30.0, mode: str = "collapsed"):
+        if bot.profiler.running:
+            await ctx.send("The profiler is already running.")
+            return
+        try:
+            bot.profiler.start(mode)
+        except ValueError as e:
+            await ctx.send(str(e))
+            return
+
+        async def stop_later():
+            await asyncio.sleep(seconds)
+            await send_profile(ctx.channel)
+
+        bot.profiler_task = asyncio.create_task(stop_later())
+        await ctx.send(f"Profiling ({mode}) for {seconds:g} seconds.")
+
+    @profile.command(name="stop")
+    @commands.is_owner()
+    async def profile_stop(ctx):
+        if not bot.profiler.running:
+            await ctx.send("The profiler is not running.")
+            return
+        if bot.profiler_task is not None:
+            bot.profiler_task.cancel()
+        await send_profile(ctx.channel)
+
+    @bot.group(invoke_without_command=True)
+    @commands.is_owner()
+    async def memory(ctx):
+        """
+        Inspects memory usage of the running bot.
+        Usage:
+        !memory                      -> Shows cache sizes and live view/session counts
+        !memory snapshot             -> Takes a tracemalloc snapshot (starts tracing on first use)
+        !memory diff [first] [second] -> Shows the top growth sites between two snapshots (default: last two)
+        !memory stop                 -> Stops tracing and discards snapshots
+        """
+        embed = discord.Embed(title="Memory", color=0x9C84EF)
+        for name, count in cache_counts(bot).items():
+            embed.add_field(name=name, value=str(count), inline=True)
+
+        objects = await asyncio.to_thread(live_object_counts)
+        object_lines = "\n".join(f"{name}: {count}" for name, count in objects) or "None"
+        embed.add_field(name="Live Objects", value=f"```{object_lines}```", inline=False)
+        tracing = f"on, {len(bot.memory.snapshots)} snapshot(s)" if bot.memory.tracing else "off"
+        embed.set_footer(text=f"tracemalloc: {tracing}")
+        await ctx.send(embed=embed)
+
+    @memory.command(name="snapshot")
+    @commands.is_owner()
+    async def memory_snapshot(ctx):
+        number = await bot.memory.snapshot()
+        await ctx.send(f"Took snapshot #{number}.")
+
+    @memory.command(name="diff")
+    @commands.is_owner()
+    async def memory_diff(ctx, first: int = -2, second: int = -1):
+        try:
+            lines = await bot.memory.diff(first, second)
+        except IndexError:
+            await ctx.send("Not enough snapshots. Take at least two with `memory snapshot`.")
+            return
+        report = "\n".join(lines) or "No differences."
+        await ctx.send(
+            "Top growth sites:",
+            file=discord.File(io.BytesIO(report.encode("utf-8")), filename="memory-diff.txt")
+        )
+
+    @memory.command(name="stop")
+    @commands.is_owner()
+    async def memory_stop(ctx):
+        bot.memory.stop()
+        await ctx.send("Stopped tracemalloc and discarded snapshots.")
+
+    @bot.command()
+    @commands.is_owner()
+    async def jobs(ctx):
+        """
+        Lists the scheduled background jobs with their run time, lag and skipped ticks.
+        """
+        lines = []
+        now = time.monotonic()
+        for job in bot.scheduler.jobs.values():
+            labels = (("job", job.name),)
+            lag = bot.metrics.histogram("ventra_job_lag_seconds", labels).percentile(0.95)
+            last = f"{job.last_duration:.2f}s" if job.last_duration is not None else "-"
+            next_run = f"{max(0.0, job.next_run - now):.0f}s" if job.next_run is not None else "-"
+            lines.append(
+                f"{job.name:<26} every {job.interval:g}s runs={job.runs} last={last} "
+                f"lag p95<={lag if lag is not None else 0:g}s skipped={job.skipped} next in {next_run}"
+            )
+        table = "\n".join(lines) or "No jobs registered."
+        await ctx.send(f"```{table}```")
+
+    @bot.hybrid_command(name="stats", description="Show per-command latency and error counts.")
+    @commands.is_owner()
+    async def stats(ctx):
+        """
+        Shows how many times each command ran, its latency percentiles and error counts.
+        """
+        errors = {}
+        for labels, count in bot.metrics.counters("ventra_command_errors_total").items():
+            command_name = dict(labels)["command"]
+            errors[command_name] = errors.get(command_name, 0) + count
+
+        lines = []
+        for labels, histogram in sorted(bot.metrics.histograms("ventra_command_duration_seconds").items()):
+            command_name = dict(labels)["command"]
+            p50 = histogram.percentile(0.5)
+            p95 = histogram.percentile(0.95)
+            lines.append(
+                f"{command_name:<16} n={histogram.count:<6} p50<={p50 * 1000:g}ms p95<={p95 * 1000:g}ms errors={int(errors.get(command_name, 0))}"
+            )
+
+        table = "\n".join(lines)
+        embed = discord.Embed(
+            title="Command Stats",
+            description=f"```{table}```" if lines else "No commands have been executed yet.",
+            color=0x9C84EF
+        )
+        await ctx.send(embed=embed)
+
+    return bot
+
+
+def run_bot(bot: DiscordBot, token: str) -> None:
+    """
+    Like ``bot.run``, but on the fast runtime's event loop when it is enabled.
+    """
+    async def runner():
+        async with bot:
+            await bot.start(token)
+
+    try:
+        runtime.run(runner())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    log_listener = setup_logging(config.get("logging"))
+    logger.info("Fast runtime: %s", runtime.enable_fast_runtime(config.get("fast_runtime", False)))
+    bot = create_bot()
+
     token = os.getenv("DISCORD_TOKEN")
     if not token:
-        print("Error: DISCORD_TOKEN not found in environment variables.")
-        print("Please create a .env file with DISCORD_TOKEN=your_token_here")
+        logger.error("DISCORD_TOKEN not found in environment variables.")
+        logger.error("Please create a .env file with DISCORD_TOKEN=your_token_here")
     else:
-        bot.run(token)
+        run_bot(bot, token)
+    log_listener.stop()
@@ -1,53 +1,171 @@
 import discord
 import random
+import time
 from discord import app_commands
 from discord.ext import commands
 
+# Discord's limit for the value of one embed field.
+FIELD_VALUE_LIMIT = 1024
+
+
 class General(commands.Cog, name="General"):
     def __init__(self, bot):
         self.bot = bot
+        self._index_version = None
+        self._index = []
+        self._embeds = {}
 
-    @commands.hybrid_command(name="help", description="List all commands the bot has loaded.")
-    async def help(self, context: commands.Context):
-        embed = discord.Embed(
-            title="Help", description="List of available commands:", color=0x9C84EF
-        )
-        for cog_name in self.bot.cogs:
-            cog = self.bot.get_cog(cog_name)
-            
-            if cog is None:
-                continue
-                
+    def command_index(self) -> list[tuple[str, list[str]]]:
+        """
+        Returns ``[(cog_name, ["/name - description", ...]), ...]`` for every cog
+        with commands. Rebuilt only when a cog was added or removed; the cached
+        embeds are dropped at the same time.
+        """
+        if self._index_version == self.bot.command_tree_version:
+            return self._index
+
+        index = []
+        for cog_name, cog in self.bot.cogs.items():
             data = []
+            seen = set()
             
             # 1. Get Standard/Hybrid Commands
             for command in cog.get_commands():
+                seen.add(command.name)
                 description = command.description.partition('\n')[0]
                 data.append(f"/{command.name} - {description}")
 
             # 2. Get Slash-Only (App) Commands (like advancedpoll)
             for command in cog.get_app_commands():
-                if command.name not in [c.name for c in cog.get_commands()]:
+                if command.name not in seen:
                     description = command.description.partition('\n')[0]
                     data.append(f"/{command.name} - {description}")
             
-            if data: # Only add field if the cog has commands
-                help_text = "\n".join(data)
-                embed.add_field(name=cog_name, value=f'```{help_text}```', inline=False)
-                
-        await context.send(embed=embed)
+            if data: # Only add cogs that have commands
+                index.append((cog_name, data))
+
+        self._index = index
+        self._index_version = self.bot.command_tree_version
+        self._embeds = {}
+        return index
+
+    @staticmethod
+    def field_values(data: list[str]) -> list[str]:
+        """
+        Packs a cog's command lines into code-block field values of at most
+        1024 characters each, Discord's limit for a field value.
+        """
+        values = []
+        lines = []
+        size = 0
+        for line in data:
+            # An over-long line alone still has to fit in a field, with the ``` fences.
+            line = line[:FIELD_VALUE_LIMIT - 6]
+            if lines and size + 1 + len(line) + 6 > FIELD_VALUE_LIMIT:
+                values.append("```{}```".format("\n".join(lines)))
+                lines, size = [], 0
+            # ``size`` is the length of the lines joined by newlines.
+            size += len(line) + (1 if lines else 0)
+            lines.append(line)
+        if lines:
+            values.append("```{}```".format("\n".join(lines)))
+        return values
+
+    def build_pages(self, description: str, index: list[tuple[str, list[str]]], footer: str) -> list[discord.Embed]:
+        """
+        Splits ``index`` into as many embeds as needed to stay within Discord's
+        limits (1024 characters per field, 25 fields, 6000 characters). A cog
+        that doesn't fit in one field continues in the next.
+        """
+        pages = []
+        embed = None
+        for cog_name, data in index:
+            for part, value in enumerate(self.field_values(data)):
+                name = cog_name if part == 0 else f"{cog_name} (cont.)"
+                if embed is None or len(embed.fields) >= 25 or len(embed) + len(name) + len(value) > 5500:
+                    embed = discord.Embed(title="Help", description=description, color=0x9C84EF)
+                    pages.append(embed)
+                embed.add_field(name=name, value=value, inline=False)
+
+        if len(pages) > 1:
+            for number, page in enumerate(pages, start=1):
+                page.set_footer(text=f"Page {number}/{len(pages)} - {footer}")
+        return pages
+
+    def help_pages(self) -> list[discord.Embed]:
+        """
+        The full command list, paged. Cached until a cog is added or removed.
+        """
+        index = self.command_index()
+        if "pages" in self._embeds:
+            return self._embeds["pages"]
+
+        pages = self.build_pages("List of available commands:", index, "use /help <page> for another page, or /help <category or command> to search")
+        if not pages:
+            pages.append(discord.Embed(title="Help", description="No commands are loaded.", color=0x9C84EF))
+        self._embeds["pages"] = pages
+        return pages
+
+    @commands.hybrid_command(name="help", description="List all commands the bot has loaded.")
+    @app_commands.describe(query="A category or command to search for", page="Page of the command list or search results")
+    async def help(self, context: commands.Context, query: str = None, page: int = 1):
+        # A bare number is a page of the full list (``!!help 2``), not a search.
+        if query is not None and query.isdigit():
+            query, page = None, int(query)
+        if query is None:
+            pages = self.help_pages()
+            await context.send(embed=pages[max(1, min(page, len(pages))) - 1])
+            return
+
+        query = query.lower().lstrip("/")
+        index = self.command_index()
+        cog_matches = [(cog_name, data) for cog_name, data in index if cog_name.lower() == query]
+        if not cog_matches:
+            cog_matches = [
+                (cog_name, matches)
+                for cog_name, data in index
+                if (matches := [line for line in data if query in line.lower()])
+            ]
+
+        pages = self.build_pages(f"Commands matching `{query}`:", cog_matches, f"use /help {query} <page> for more")
+        if not pages:
+            pages.append(discord.Embed(title="Help", description=f"No commands match `{query}`.", color=0x9C84EF))
+        await context.send(embed=pages[max(1, min(page, len(pages))) - 1])
 
     @commands.hybrid_command(name="ping", description="Check if the bot is alive.")
     async def ping(self, context: commands.Context):
         """
-        Check if the bot is alive.
+        Check if the bot is alive and how responsive it is.
         """
         embed = discord.Embed(
             title="Pong!",
             description=f"The bot latency is {round(self.bot.latency * 1000)}ms.",
             color=0x42F56C
         )
-        await context.send(embed=embed)
+        # Time exactly one REST call. For slash invocations context.send() would
+        # also fetch the original response afterwards, a second request.
+        interaction = context.interaction
+        started = time.perf_counter()
+        if interaction is not None and not interaction.response.is_done():
+            await interaction.response.send_message(embed=embed)
+            rest_rtt = time.perf_counter() - started
+            edit = interaction.edit_original_response
+        else:
+            message = await context.send(embed=embed)
+            rest_rtt = time.perf_counter() - started
+            edit = message.edit
+
+        monitor = self.bot.loop_monitor
+        lag = monitor.histogram
+        embed.add_field(name="REST Round-Trip", value=f"{round(rest_rtt * 1000)}ms", inline=True)
+        if lag.count:
+            embed.add_field(
+                name="Event Loop Lag",
+                value=f"p50 <= {lag.percentile(0.5) * 1000:g}ms\np99 <= {lag.percentile(0.99) * 1000:g}ms\nmax {monitor.max_lag * 1000:.1f}ms",
+                inline=True
+            )
+        embed.add_field(name="Loop Stalls", value=str(len(monitor.stalls)), inline=True)
+        await edit(embed=embed)
 
     @commands.hybrid_command(name="invite", description="Get the invite link of the bot.")
     async def invite(self, context: commands.Context):
@@ -84,5 +202,46 @@ class General(commands.Cog, name="General"):
         
         await context.send(embed=embed)
 
+    @commands.guild_only()
+    @app_commands.guild_only()
+    @commands.hybrid_command(name="prefix", description="Show or change the command prefix for this server.")
+    @app_commands.describe(new_prefix="The new prefix, or 'reset' to go back to the default")
+    async def prefix(self, context: commands.Context, new_prefix: str = None):
+        """
+        Show or change the command prefix for this server.
+        Usage: /prefix [new_prefix|reset]
+        """
+        default_prefix = self.bot.config["prefix"]
+        if new_prefix is None:
+            current = self.bot.guild_prefixes.get(context.guild.id, default_prefix)
+            embed = discord.Embed(
+                description=f"The prefix for this server is `{current}`.",
+                color=0x9C84EF
+            )
+            await context.send(embed=embed)
+            return
+
+        if not context.author.guild_permissions.manage_guild:
+            raise commands.MissingPermissions(["manage_guild"])
+
+        if new_prefix.lower() == "reset" or new_prefix == default_prefix:
+            await self.bot.set_guild_prefix(context.guild.id, None)
+            description = f"The prefix has been reset to `{default_prefix}`."
+        elif len(new_prefix) > 10 or any(char.isspace() for char in new_prefix):
+            embed = discord.Embed(
+                description="The prefix must be at most 10 characters and cannot contain spaces.",
+                color=0xE02B2B
+            )
+            await context.send(embed=embed)
+            return
+        else:
+            await self.bot.set_guild_prefix(context.guild.id, new_prefix)
+            description = f"The prefix for this server is now `{new_prefix}`."
+
+        if self.bot.cache_policy["slash_only"]:
+            description += "\nThe bot is running in slash-only mode, so prefix commands only work by mentioning it."
+        embed = discord.Embed(description=description, color=0x42F56C)
+        await context.send(embed=embed)
+
 async def setup(bot):
     await bot.add_cog(General(bot))
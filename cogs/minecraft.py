@@ -1,8 +1,17 @@
+import asyncio
+import logging
+
 import discord
-from discord.ext import commands, tasks
-from mcstatus import JavaServer
+from discord.ext import commands
 from typing import List
 
+from utils.probes import StatusProber, mcstatus_api
+
+# mcstatus (and dnspython under it) adds ~100ms to startup, so utils.probes
+# imports it on first use, and on_ready warms the import in a worker thread.
+
+logger = logging.getLogger("ventra.minecraft")
+
 def parse_motd(description) -> str:
     """
     Parses Minecraft MOTD (string or dict) into Discord-compatible ANSI escape codes.
@@ -108,10 +117,23 @@ def parse_motd(description) -> str:
 class Minecraft(commands.Cog, name="Minecraft"):
     def __init__(self, bot):
         self.bot = bot
-        self.update_status.start()
+        probes = bot.config.get("status_probes", {})
+        self.prober = StatusProber(
+            bot.metrics, probes.get("deadline", 2.5), probes.get("stagger", 0.25), probes.get("hedge", True)
+        )
+        self.status_job = self.bot.scheduler.add_job("minecraft.update_status", 60.0, self.update_status, jitter=5.0)
 
     def cog_unload(self):
-        self.update_status.cancel()
+        self.bot.scheduler.remove_job("minecraft.update_status")
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        """
+        Imports mcstatus in a worker thread once startup is done, so the first
+        probe doesn't pay for the import on the event loop. An unusable
+        mcstatus install is reported here, at startup.
+        """
+        await asyncio.to_thread(mcstatus_api)
 
     @commands.hybrid_command(name="status", description="Check the status of a Minecraft server.")
     @discord.app_commands.describe(server_ip="The IP address of the server (e.g., ventra.dev)")
@@ -120,11 +142,19 @@ class Minecraft(commands.Cog, name="Minecraft"):
         Check the status of a Minecraft server.
         Usage: /status <server_ip>
         """
-        await context.typing()
-        
+        cooldown = self.bot.rate_limiter.check_probe(server_ip)
+        if cooldown is not None:
+            raise cooldown
+
+        # Acknowledge the slash command right away; the probe has its own deadline.
+        # defer() does nothing for prefix commands, so those get the typing indicator.
+        if context.interaction is not None:
+            await context.defer()
+        else:
+            await context.typing()
+
         try:
-            server = await JavaServer.async_lookup(server_ip)
-            status = await server.async_status()
+            status = await self.prober.status(server_ip)
             
             embed = discord.Embed(
                 title=f"Minecraft Server Status: {server_ip}",
@@ -140,6 +170,9 @@ class Minecraft(commands.Cog, name="Minecraft"):
             
             await context.send(embed=embed)
             
+        except ImportError:
+            # A broken mcstatus install is a bug to surface, not an offline server.
+            raise
         except Exception as e:
             embed = discord.Embed(
                 title=f"Minecraft Server Status: {server_ip}",
@@ -170,11 +203,17 @@ class Minecraft(commands.Cog, name="Minecraft"):
         Get the list of players currently on a Minecraft server.
         Usage: /player-list <server_ip>
         """
-        await context.typing()
+        cooldown = self.bot.rate_limiter.check_probe(server_ip)
+        if cooldown is not None:
+            raise cooldown
+
+        if context.interaction is not None:
+            await context.defer()
+        else:
+            await context.typing()
 
         try:
-            server = await JavaServer.async_lookup(server_ip)
-            status = await server.async_status()
+            status = await self.prober.status(server_ip)
             
             if status.players.sample:
                 player_names = [p.name for p in status.players.sample]
@@ -197,6 +236,8 @@ class Minecraft(commands.Cog, name="Minecraft"):
             
             await context.send(embed=embed)
 
+        except ImportError:
+            raise
         except Exception as e:
             embed = discord.Embed(
                 title=f"Error querying {server_ip}",
@@ -219,52 +260,72 @@ class Minecraft(commands.Cog, name="Minecraft"):
             if current.lower() in server.lower()
         ][:25]
 
-    @tasks.loop(minutes=1.0)
+    async def probe_status(self, target_server: str) -> dict:
+        """
+        Queries a server once and returns a picklable summary, so the result can
+        be shared with other shard clusters through the bot's shared cache.
+        """
+        checked_at = discord.utils.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+        try:
+            status = await self.prober.status(target_server)
+        except ImportError:
+            raise
+        except Exception as e:
+            return {"online": False, "error": str(e), "checked_at": checked_at}
+
+        return {
+            "online": True,
+            "players": f"{status.players.online}/{status.players.max}",
+            "latency": round(status.latency),
+            "version": status.version.name,
+            "motd": parse_motd(status.description),
+            "checked_at": checked_at,
+        }
+
     async def update_status(self):
         """
-        Background task to update the server status in the 'server-status' channel.
+        Background job (every minute) to update the server status in the 'server-status' channel.
+        The server is probed once per tick (across all clusters), not once per guild.
         """
-        await self.bot.wait_until_ready()
-        
         target_server = "ventra.dev"
-        
-        for guild in self.bot.guilds:
-            channel = None
-            for ch in guild.text_channels:
-                if "server-status" in ch.name or "server_status" in ch.name:
-                    channel = ch
-                    break
-            
-            if channel:
-                try:
-                    try:
-                        server = await JavaServer.async_lookup(target_server)
-                        status = await server.async_status()
-                        
-                        embed = discord.Embed(
-                            title=f"Server Status: {target_server}",
-                            description="Updated every 1 minute.",
-                            color=0x42F56C
-                        )
-                        embed.add_field(name="Status", value="🟢 Online", inline=True)
-                        embed.add_field(name="Players", value=f"{status.players.online}/{status.players.max}", inline=True)
-                        embed.add_field(name="Latency", value=f"{round(status.latency)}ms", inline=True)
-                        embed.add_field(name="Version", value=status.version.name, inline=False)
-                        
-                        description = status.description
-                        motd = parse_motd(description)
-                        embed.add_field(name="MOTD", value=f"```ansi\n{motd}```", inline=False)
-                        
-                        embed.set_footer(text=f"Last Updated: {discord.utils.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC")
-                        
-                    except Exception as e:
-                        embed = discord.Embed(
-                            title=f"Server Status: {target_server}",
-                            description=f"🔴 Offline or Unreachable\nError: {str(e)}",
-                            color=0xE02B2B
-                        )
-                        embed.set_footer(text=f"Last Updated: {discord.utils.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC")
+        # Slightly shorter than the job interval, so each tick's first cluster probes again.
+        result = await self.bot.shared_cache.fetch(
+            f"mcstatus:{target_server}", self.status_job.interval * 0.9, lambda: self.probe_status(target_server)
+        )
+        if result is None:
+            return
 
+        if result["online"]:
+            embed = discord.Embed(
+                title=f"Server Status: {target_server}",
+                description="Updated every 1 minute.",
+                color=0x42F56C
+            )
+            embed.add_field(name="Status", value="🟢 Online", inline=True)
+            embed.add_field(name="Players", value=result["players"], inline=True)
+            embed.add_field(name="Latency", value=f"{result['latency']}ms", inline=True)
+            embed.add_field(name="Version", value=result["version"], inline=False)
+            embed.add_field(name="MOTD", value=f"```ansi\n{result['motd']}```", inline=False)
+        else:
+            embed = discord.Embed(
+                title=f"Server Status: {target_server}",
+                description=f"🔴 Offline or Unreachable\nError: {result['error']}",
+                color=0xE02B2B
+            )
+        embed.set_footer(text=f"Last Updated: {result['checked_at']} UTC")
+
+        await asyncio.gather(*(self.update_guild_status(guild, embed) for guild in self.bot.iter_active_guilds()))
+
+    async def update_guild_status(self, guild: discord.Guild, embed: discord.Embed):
+        channel = None
+        for ch in guild.text_channels:
+            if "server-status" in ch.name or "server_status" in ch.name:
+                channel = ch
+                break
+        
+        if channel:
+            try:
+                async with self.bot.scheduler.rest_slot():
                     last_message = None
                     async for message in channel.history(limit=10):
                         if message.author == self.bot.user:
@@ -275,13 +336,9 @@ class Minecraft(commands.Cog, name="Minecraft"):
                         await last_message.edit(embed=embed)
                     else:
                         await channel.send(embed=embed)
-                        
-                except Exception as e:
-                    print(f"Error updating server status in guild {guild.name}: {e}")
-
-    @update_status.before_loop
-    async def before_update_status(self):
-        await self.bot.wait_until_ready()
+                    
+            except Exception as e:
+                logger.warning("Error updating server status in guild %s: %s", guild.name, e)
 
 async def setup(bot):
     await bot.add_cog(Minecraft(bot))
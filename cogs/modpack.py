@@ -1,7 +1,13 @@
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 import aiohttp
+import asyncio
 import datetime
+import logging
+
+from utils import runtime
+
+logger = logging.getLogger("ventra.modpack")
 
 MODPACK_SLUG = "ventra-modpack"
 API_URL = f"https://api.modrinth.com/v2/project/{MODPACK_SLUG}/version"
@@ -32,26 +38,34 @@ class SubscriptionView(discord.ui.View):
 class Modpack(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.check_updates.start()
+        self.bot.scheduler.add_job("modpack.check_updates", 300.0, self.check_updates, jitter=15.0)
 
     def cog_unload(self):
-        self.check_updates.cancel()
-
-    @tasks.loop(minutes=5.0)
-    async def check_updates(self):
-        await self.bot.wait_until_ready()
+        self.bot.scheduler.remove_job("modpack.check_updates")
 
+    async def fetch_versions(self):
+        """
+        Fetches the version list from Modrinth, or None if the request failed.
+        """
         async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(API_URL) as response:
-                    if response.status == 200:
-                        versions = await response.json()
-                        if versions:
-                            await self.process_versions(versions[0])
-                    else:
-                        print(f"Failed to fetch modpack versions: {response.status}")
-            except Exception as e:
-                print(f"Error in modpack update loop: {e}")
+            async with session.get(API_URL) as response:
+                if response.status == 200:
+                    # Hand orjson the raw bytes; response.json() would decode them to str first.
+                    return runtime.loads(await response.read())
+                logger.warning("Failed to fetch modpack versions: %s", response.status)
+                return None
+
+    async def check_updates(self):
+        """
+        Background job (every 5 minutes) checking Modrinth for a new version.
+        """
+        try:
+            # Shared so that only one shard cluster hits Modrinth per tick.
+            versions = await self.bot.shared_cache.fetch("modrinth:versions", 280, self.fetch_versions)
+            if versions:
+                await self.process_versions(versions[0])
+        except Exception as e:
+            logger.error("Error in modpack update loop: %s", e)
 
     async def process_versions(self, latest_version):
         version_number = latest_version['version_number']
@@ -69,54 +83,63 @@ class Modpack(commands.Cog):
         except Exception:
             timestamp = int(discord.utils.utcnow().timestamp())
 
-        for guild in self.bot.guilds:
-            channel = None
-            for ch in guild.text_channels:
-                if CHANNEL_NAME in ch.name:
-                    channel = ch
-                    break
-            
-            if not channel:
-                continue
-
-            status_msg = None
-            async for msg in channel.history(limit=20):
-                if msg.author == self.bot.user and msg.embeds and msg.embeds[0].title == "Ventra Modpack Status":
-                    status_msg = msg
-                    break
-            
-            embed = discord.Embed(
-                title="Ventra Modpack Status",
-                url=f"https://modrinth.com/modpack/{MODPACK_SLUG}",
-                color=0x42F56C
-            )
-            embed.add_field(name="Latest Version", value=version_number, inline=True)
-            embed.add_field(name="Version Name", value=version_name, inline=True)
-            embed.add_field(name="Released", value=f"<t:{timestamp}:R>", inline=False)
-            embed.add_field(name="Changelog", value=f"```{changelog}```", inline=False)
-            embed.set_footer(text=f"Version ID: {version_id}")
-
-            view = SubscriptionView()
-
-            if status_msg:
-                current_footer = status_msg.embeds[0].footer.text
-                if current_footer != f"Version ID: {version_id}":
-                    await status_msg.edit(embed=embed, view=view)
-                    async for msg in channel.history(limit=50):
-                        if msg.author == self.bot.user and msg.id != status_msg.id:
-                            if "**New Update Available:**" in msg.content:
-                                try:
-                                    await msg.delete()
-                                except discord.HTTPException:
-                                    pass
-
-                    role = discord.utils.get(guild.roles, name=ROLE_NAME)
-                    if role:
-                        await channel.send(f"{role.mention} **New Update Available:** {version_number} - {version_name}")
-                    else:
-                        await channel.send(f"**New Update Available:** {version_number} - {version_name}")
-            else:
-                await channel.send(embed=embed, view=view)
+        embed = discord.Embed(
+            title="Ventra Modpack Status",
+            url=f"https://modrinth.com/modpack/{MODPACK_SLUG}",
+            color=0x42F56C
+        )
+        embed.add_field(name="Latest Version", value=version_number, inline=True)
+        embed.add_field(name="Version Name", value=version_name, inline=True)
+        embed.add_field(name="Released", value=f"<t:{timestamp}:R>", inline=False)
+        embed.add_field(name="Changelog", value=f"```{changelog}```", inline=False)
+        embed.set_footer(text=f"Version ID: {version_id}")
+
+        await asyncio.gather(*(
+            self.update_guild(guild, embed, version_id, version_number, version_name)
+            for guild in self.bot.iter_active_guilds()
+        ))
+
+    async def update_guild(self, guild, embed, version_id, version_number, version_name):
+        channel = None
+        for ch in guild.text_channels:
+            if CHANNEL_NAME in ch.name:
+                channel = ch
+                break
+        
+        if not channel:
+            return
+
+        try:
+            async with self.bot.scheduler.rest_slot():
+                status_msg = None
+                async for msg in channel.history(limit=20):
+                    if msg.author == self.bot.user and msg.embeds and msg.embeds[0].title == "Ventra Modpack Status":
+                        status_msg = msg
+                        break
+
+                view = SubscriptionView()
+
+                if status_msg:
+                    current_footer = status_msg.embeds[0].footer.text
+                    if current_footer != f"Version ID: {version_id}":
+                        await status_msg.edit(embed=embed, view=view)
+                        async for msg in channel.history(limit=50):
+                            if msg.author == self.bot.user and msg.id != status_msg.id:
+                                if "**New Update Available:**" in msg.content:
+                                    try:
+                                        await msg.delete()
+                                    except discord.HTTPException:
+                                        pass
+
+                        role = discord.utils.get(guild.roles, name=ROLE_NAME)
+                        if role:
+                            await channel.send(f"{role.mention} **New Update Available:** {version_number} - {version_name}")
+                        else:
+                            await channel.send(f"**New Update Available:** {version_number} - {version_name}")
+                else:
+                    await channel.send(embed=embed, view=view)
+        except Exception as e:
+            logger.warning("Error updating modpack status in guild %s: %s", guild.name, e)
 
 async def setup(bot):
     bot.add_view(SubscriptionView())
@@ -1,27 +1,324 @@
+import asyncio
+import logging
+import secrets
+import time
+
 import discord
 from discord import app_commands
 from discord.ext import commands
 
+from utils import runtime
+
+logger = logging.getLogger("ventra.polls")
+
+DEFAULT_EMOJIS = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣"]
+
+
+class Poll:
+    """
+    In-memory state of a single poll. Votes are counted here as they come in;
+    the message is only edited (and the votes checkpointed) by the debounced
+    flush in the Utility cog.
+    """
+
+    def __init__(self, poll_id: str, guild_id: int | None, channel_id: int, message_id: int, title: str,
+                 options: list, author: str, author_id: int, ends_at: float | None = None) -> None:
+        self.poll_id = poll_id
+        # None for polls in DMs.
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.message_id = message_id
+        self.title = title
+        # [(label, emoji), ...]
+        self.options = options
+        self.author = author
+        self.author_id = author_id
+        # Unix time the poll closes at, or None to stay open until closed by hand.
+        self.ends_at = ends_at
+        self.closed = False
+        self.view: discord.ui.View | None = None
+        self.votes: dict[int, int] = {}
+        self.counts = [0] * len(options)
+        # Votes changed since the last checkpoint; None means the vote was removed.
+        self.pending: dict[int, int | None] = {}
+        self.last_edit = 0.0
+        self.flush_task: asyncio.Task | None = None
+
+    def expired(self) -> bool:
+        return self.ends_at is not None and self.ends_at <= time.time()
+
+    def vote(self, user_id: int, option: int) -> int | None:
+        """
+        Records a vote, moving it if the user already voted for something else
+        and removing it if they picked the same option again. Returns the
+        user's option afterwards.
+        """
+        previous = self.votes.get(user_id)
+        if previous is not None:
+            self.counts[previous] -= 1
+        if previous == option:
+            del self.votes[user_id]
+            current = None
+        else:
+            self.votes[user_id] = option
+            self.counts[option] += 1
+            current = option
+        self.pending[user_id] = current
+        return current
+
+    def embed(self) -> discord.Embed:
+        total = sum(self.counts)
+        description = ""
+        for (label, emoji), count in zip(self.options, self.counts):
+            share = count / total if total else 0
+            bar = "█" * round(share * 10) + "░" * (10 - round(share * 10))
+            description += f"{emoji} {label}\n`{bar}` {count} ({share:.0%})\n\n"
+        if self.closed:
+            description += "🔒 This poll is closed."
+        elif self.ends_at is not None:
+            description += f"⏰ Closes <t:{int(self.ends_at)}:R>"
+
+        embed = discord.Embed(
+            title=f"📊 {self.title}",
+            description=description,
+            color=0x99AAB5 if self.closed else 0x42F56C
+        )
+        embed.set_footer(text=f"Poll created by {self.author} • {total} vote{'s' if total != 1 else ''}")
+        return embed
+
+
+class PollButton(discord.ui.Button):
+    def __init__(self, poll: Poll, option: int, with_emoji: bool = True):
+        label, emoji = poll.options[option]
+        super().__init__(
+            label=label[:80],
+            emoji=emoji if with_emoji else None,
+            style=discord.ButtonStyle.secondary,
+            custom_id=f"ventra_poll:{poll.poll_id}:{option}"
+        )
+        self.poll = poll
+        self.option = option
+
+    async def callback(self, interaction: discord.Interaction):
+        if self.poll.closed:
+            await interaction.response.send_message("This poll is closed.", ephemeral=True)
+            return
+        if self.poll.expired():
+            # Don't wait for the next close_expired run; answer the click with the final results.
+            await interaction.client.get_cog("Utility").close_poll(self.poll, interaction)
+            return
+        current = self.poll.vote(interaction.user.id, self.option)
+        if current is None:
+            await interaction.response.send_message("Your vote has been removed.", ephemeral=True)
+        else:
+            await interaction.response.send_message(f"You voted for **{self.poll.options[current][0]}**.", ephemeral=True)
+        interaction.client.get_cog("Utility").schedule_flush(self.poll)
+
+
+class ClosePollButton(discord.ui.Button):
+    def __init__(self, poll: Poll):
+        super().__init__(
+            label="Close poll",
+            style=discord.ButtonStyle.danger,
+            custom_id=f"ventra_poll:{poll.poll_id}:close",
+            row=1
+        )
+        self.poll = poll
+
+    async def callback(self, interaction: discord.Interaction):
+        if interaction.user.id != self.poll.author_id and not interaction.permissions.manage_messages:
+            await interaction.response.send_message(
+                "Only the poll's author or members with Manage Messages can close it.", ephemeral=True
+            )
+            return
+        await interaction.client.get_cog("Utility").close_poll(self.poll, interaction)
+
+
+class PollView(discord.ui.View):
+    def __init__(self, poll: Poll, with_emoji: bool = True):
+        super().__init__(timeout=None)
+        for option in range(len(poll.options)):
+            self.add_item(PollButton(poll, option, with_emoji))
+        self.add_item(ClosePollButton(poll))
+
+
 class Utility(commands.Cog, name="Utility"):
     def __init__(self, bot):
         self.bot = bot
+        self.polls: dict[str, Poll] = {}
+        self.update_interval = bot.config.get("polls", {}).get("update_interval", 5.0)
+        self.bot.scheduler.add_job("polls.close_expired", 30.0, self.close_expired, jitter=2.0)
+
+    async def cog_load(self):
+        """
+        Restores the polls of guilds this process handles from the database.
+        Under the cluster launcher, other clusters never see those polls'
+        votes, so only the owning cluster may update or close them. Open
+        polls get their buttons back so they keep working after a restart;
+        polls that ran out while the bot was offline are finalised by the
+        first ``close_expired`` run.
+        """
+        rows = await self.bot.database.execute(
+            "SELECT poll_id, guild_id, channel_id, message_id, title, options, author, author_id, ends_at FROM polls"
+        )
+        for poll_id, guild_id, channel_id, message_id, title, options, author, author_id, ends_at in rows:
+            if not self.bot.owns_guild(guild_id):
+                continue
+            self.polls[poll_id] = Poll(
+                poll_id, guild_id, channel_id, message_id, title, [tuple(option) for option in runtime.loads(options)],
+                author, author_id, ends_at
+            )
+
+        votes = await self.bot.database.execute("SELECT poll_id, user_id, option FROM poll_votes")
+        for poll_id, user_id, option in votes:
+            poll = self.polls.get(poll_id)
+            if poll is not None:
+                poll.votes[user_id] = option
+                poll.counts[option] += 1
+
+        for poll in self.polls.values():
+            if not poll.expired():
+                poll.view = PollView(poll)
+                self.bot.add_view(poll.view, message_id=poll.message_id)
+
+    async def cog_unload(self):
+        self.bot.scheduler.remove_job("polls.close_expired")
+        for poll in list(self.polls.values()):
+            if poll.flush_task is not None:
+                poll.flush_task.cancel()
+                # Wait for a checkpoint the cancel interrupted to unwind, so what it left pending is written below.
+                await asyncio.wait([poll.flush_task])
+            if poll.pending:
+                await self.checkpoint(poll)
+
+    def schedule_flush(self, poll: Poll) -> None:
+        """
+        Makes sure a flush is pending for the poll. However fast votes arrive,
+        the message is edited at most once per ``update_interval`` seconds.
+        """
+        if poll.flush_task is None:
+            poll.flush_task = asyncio.create_task(self.flush(poll))
+
+    async def flush(self, poll: Poll) -> None:
+        try:
+            while poll.pending:
+                delay = poll.last_edit + self.update_interval - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await self.checkpoint(poll)
+                poll.last_edit = time.monotonic()
+                try:
+                    message = self.bot.get_partial_messageable(poll.channel_id).get_partial_message(poll.message_id)
+                    await message.edit(embed=poll.embed())
+                except discord.NotFound:
+                    await self.delete_poll(poll)
+                    return
+                except discord.HTTPException as e:
+                    logger.warning("Could not update poll %s: %s", poll.poll_id, e)
+        finally:
+            poll.flush_task = None
+
+    async def checkpoint(self, poll: Poll) -> None:
+        """
+        Writes the votes changed since the last checkpoint. They leave
+        ``pending`` only once written, so a failed or cancelled write is
+        retried by the next checkpoint.
+        """
+        pending = dict(poll.pending)
+        removed = [(poll.poll_id, user_id) for user_id, option in pending.items() if option is None]
+        changed = [(poll.poll_id, user_id, option) for user_id, option in pending.items() if option is not None]
+        if removed:
+            await self.bot.database.executemany("DELETE FROM poll_votes WHERE poll_id = ? AND user_id = ?", removed)
+        if changed:
+            await self.bot.database.executemany(
+                "INSERT INTO poll_votes (poll_id, user_id, option) VALUES (?, ?, ?) "
+                "ON CONFLICT(poll_id, user_id) DO UPDATE SET option = excluded.option",
+                changed
+            )
+        for user_id, option in pending.items():
+            # Keep votes that changed again while the write was running.
+            if user_id in poll.pending and poll.pending[user_id] == option:
+                del poll.pending[user_id]
+
+    async def close_poll(self, poll: Poll, interaction: discord.Interaction | None = None) -> None:
+        """
+        Ends the poll: votes stop being accepted, the message keeps the final
+        results without buttons and the poll is removed from the database.
+        When closed from a button, ``interaction`` is answered with the edit.
+        """
+        if poll.closed:
+            return
+        poll.closed = True
+        self.polls.pop(poll.poll_id, None)
+        if poll.view is not None:
+            poll.view.stop()
+        if poll.flush_task is not None:
+            poll.flush_task.cancel()
+            await asyncio.wait([poll.flush_task])
+
+        try:
+            if interaction is not None:
+                await interaction.response.edit_message(embed=poll.embed(), view=None)
+            else:
+                message = self.bot.get_partial_messageable(poll.channel_id).get_partial_message(poll.message_id)
+                await message.edit(embed=poll.embed(), view=None)
+        except discord.NotFound:
+            pass
+        except discord.HTTPException as e:
+            logger.warning("Could not close poll %s: %s", poll.poll_id, e)
+        await self.delete_poll(poll)
+
+    async def close_expired(self) -> None:
+        for poll in [poll for poll in self.polls.values() if poll.expired()]:
+            async with self.bot.scheduler.rest_slot():
+                await self.close_poll(poll)
+
+    async def delete_poll(self, poll: Poll) -> None:
+        self.polls.pop(poll.poll_id, None)
+        await self.bot.database.execute("DELETE FROM poll_votes WHERE poll_id = ?", (poll.poll_id,))
+        await self.bot.database.execute("DELETE FROM polls WHERE poll_id = ?", (poll.poll_id,))
+
+    async def start_poll(self, send, title: str, options: list, author: discord.abc.User,
+                         duration: int | None = None) -> tuple[Poll, bool]:
+        """
+        Sends the poll with one button per option using ``send`` (a coroutine
+        taking ``embed`` and ``view`` and returning the message) and stores it.
+        With ``duration`` (minutes) the poll closes by itself.
+        If Discord rejects one of the emojis the poll is sent without them;
+        the second value returned is False in that case.
+        """
+        ends_at = time.time() + duration * 60 if duration else None
+        poll = Poll(secrets.token_hex(8), None, 0, 0, title, options, str(author), author.id, ends_at)
+        with_emoji = True
+        try:
+            poll.view = PollView(poll)
+            message = await send(embed=poll.embed(), view=poll.view)
+        except discord.HTTPException:
+            with_emoji = False
+            poll.view = PollView(poll, with_emoji=False)
+            message = await send(embed=poll.embed(), view=poll.view)
+
+        poll.guild_id = message.guild.id if message.guild is not None else None
+        poll.channel_id = message.channel.id
+        poll.message_id = message.id
+        self.polls[poll.poll_id] = poll
+        await self.bot.database.execute(
+            "INSERT INTO polls (poll_id, guild_id, channel_id, message_id, title, options, author, author_id, ends_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (poll.poll_id, poll.guild_id, poll.channel_id, poll.message_id, title, runtime.dumps(options),
+             poll.author, poll.author_id, ends_at)
+        )
+        return poll, with_emoji
 
     @commands.hybrid_command(name="poll", description="Create a simple Yes/No poll.")
     @app_commands.describe(question="The question for the poll")
     async def poll(self, context: commands.Context, *, question: str):
         """
-        Create a simple poll with Thumbs Up and Thumbs Down reactions.
+        Create a simple Yes/No poll with vote buttons.
         """
-        embed = discord.Embed(
-            title="📊 Poll",
-            description=question,
-            color=0x42F56C
+        await self.start_poll(
+            context.send, question, [("Yes", "👍"), ("No", "👎")], context.author
         )
-        embed.set_footer(text=f"Poll created by {context.author}")
-        
-        message = await context.send(embed=embed)
-        await message.add_reaction("👍")
-        await message.add_reaction("👎")
 
     @commands.guild_only()
     @app_commands.guild_only()
@@ -69,6 +366,7 @@ class Utility(commands.Cog, name="Utility"):
         emoji4="Emoji for fourth option (optional)",
         option5="Fifth option (optional)",
         emoji5="Emoji for fifth option (optional)",
+        duration="Close the poll automatically after this many minutes (optional)",
     )
     async def advanced_poll(
         self, 
@@ -83,7 +381,8 @@ class Utility(commands.Cog, name="Utility"):
         option4: str = None, 
         emoji4: str = None,
         option5: str = None,
-        emoji5: str = None
+        emoji5: str = None,
+        duration: app_commands.Range[int, 1, 10080] = None
     ):
         """
         Create an advanced poll with up to 5 options and optional custom emojis.
@@ -99,28 +398,17 @@ class Utility(commands.Cog, name="Utility"):
         valid_options = []
         for i, (opt, emo) in enumerate(raw_options):
             if opt:
-                default_emoji = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣"][i]
-                valid_options.append((opt, emo if emo else default_emoji))
+                valid_options.append((opt, emo if emo else DEFAULT_EMOJIS[i]))
 
-        description = ""
-        for option, emoji in valid_options:
-            description += f"{emoji} {option}\n\n"
-            
-        embed = discord.Embed(
-            title=f"📊 {title}",
-            description=description,
-            color=0x42F56C
-        )
-        embed.set_footer(text=f"Poll created by {interaction.user}")
-        
-        await interaction.response.send_message(embed=embed)
-        message = await interaction.original_response()
-        
-        for option, emoji in valid_options:
-            try:
-                await message.add_reaction(emoji)
-            except discord.HTTPException:
-                await interaction.followup.send(f"Could not add reaction for emoji: {emoji}. Please make sure it is a valid emoji.", ephemeral=True)
+        async def send(**kwargs):
+            if interaction.response.is_done():
+                return await interaction.followup.send(wait=True, **kwargs)
+            await interaction.response.send_message(**kwargs)
+            return await interaction.original_response()
+
+        _, with_emoji = await self.start_poll(send, title, valid_options, interaction.user, duration)
+        if not with_emoji:
+            await interaction.followup.send("Some of the emojis were not valid, so the poll was posted without them.", ephemeral=True)
 
 async def setup(bot):
     await bot.add_cog(Utility(bot))
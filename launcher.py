@@ -0,0 +1,119 @@
+"""
+Runs the bot as several processes ("clusters"), each owning a slice of the
+shards, so a large bot can use more than one CPU core.
+
+Requires ``"sharding": {"enabled": true}`` in config.json. Usage:
+
+    python launcher.py
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import sys
+from typing import Callable, List, Optional
+
+import aiohttp
+import discord
+
+import bot as bot_module
+from utils import runtime
+from utils.logger import setup_logging
+from utils.shared_cache import SharedCache
+
+logger = logging.getLogger("ventra.launcher")
+
+
+def split_shards(shard_count: int, clusters: int) -> List[List[int]]:
+    """
+    Splits shard ids into ``clusters`` contiguous, evenly sized groups.
+    """
+    clusters = max(1, min(clusters, shard_count))
+    size, remainder = divmod(shard_count, clusters)
+    groups = []
+    start = 0
+    for index in range(clusters):
+        end = start + size + (1 if index < remainder else 0)
+        groups.append(list(range(start, end)))
+        start = end
+    return groups
+
+
+async def fetch_recommended_shards(token: str) -> int:
+    """
+    Asks Discord how many shards it recommends for this bot.
+    """
+    headers = {"Authorization": f"Bot {token}"}
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{discord.http.Route.BASE}/gateway/bot", headers=headers) as response:
+            response.raise_for_status()
+            data = await response.json()
+    return data["shards"]
+
+
+def run_cluster(cluster_id: int, shard_ids: List[int], shard_count: int, shared_data, shared_lock, token: str,
+                bot_factory: Callable[..., discord.Client] = bot_module.create_bot) -> None:
+    """
+    Entry point of a single cluster process.
+    """
+    log_listener = setup_logging(bot_module.config.get("logging"))
+    logger.info("Cluster %d starting with shards %s", cluster_id, shard_ids)
+    runtime.enable_fast_runtime(bot_module.config.get("fast_runtime", False))
+    bot = bot_factory(
+        shard_ids=shard_ids,
+        shard_count=shard_count,
+        shared_cache=SharedCache(shared_data, shared_lock),
+    )
+    try:
+        bot_module.run_bot(bot, token)
+    finally:
+        log_listener.stop()
+
+
+def launch(token: str, shard_count: Optional[int] = None, clusters: int = 1,
+           bot_factory: Callable[..., discord.Client] = bot_module.create_bot) -> None:
+    """
+    Starts one process per cluster and waits for all of them to exit.
+    """
+    if not shard_count:
+        shard_count = asyncio.run(fetch_recommended_shards(token))
+
+    groups = split_shards(shard_count, clusters)
+    logger.info("Launching %d shard(s) across %d cluster(s)", shard_count, len(groups))
+
+    with multiprocessing.Manager() as manager:
+        shared_data = manager.dict()
+        shared_lock = manager.Lock()
+        processes = [
+            multiprocessing.Process(
+                target=run_cluster,
+                args=(cluster_id, shard_ids, shard_count, shared_data, shared_lock, token, bot_factory),
+                name=f"ventra-cluster-{cluster_id}",
+            )
+            for cluster_id, shard_ids in enumerate(groups)
+        ]
+        for process in processes:
+            process.start()
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.join()
+
+
+if __name__ == "__main__":
+    sharding = bot_module.config.get("sharding", {})
+    if not sharding.get("enabled"):
+        sys.exit("Sharding is disabled. Set \"sharding\": {\"enabled\": true} in config.json or run bot.py directly.")
+
+    log_listener = setup_logging(bot_module.config.get("logging"))
+    token = os.getenv("DISCORD_TOKEN")
+    if not token:
+        logger.error("DISCORD_TOKEN not found in environment variables.")
+    else:
+        launch(token, sharding.get("shard_count"), sharding.get("clusters", 1))
+    log_listener.stop()
@@ -0,0 +1,5 @@
+import pathlib
+import sys
+
+# Tests import the bot's modules (bot, utils, cogs, benchmarks) from the repository root.
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
@@ -0,0 +1,23 @@
+import discord
+import pytest
+
+from utils.cache_policy import member_cache_flags
+
+
+def test_flag_list_only_enables_listed_flags():
+    flags = member_cache_flags(["voice"], discord.Intents.default())
+    assert flags.voice
+    assert not flags.joined
+
+
+def test_unknown_flag_is_a_config_error():
+    with pytest.raises(ValueError, match="Unknown cache.members flag"):
+        member_cache_flags(["voice", "joind"], discord.Intents.default())
+
+
+def test_flag_needing_members_intent_is_a_config_error():
+    with pytest.raises(ValueError, match="members intent"):
+        member_cache_flags(["joined"], discord.Intents.default())
+    intents = discord.Intents.default()
+    intents.members = True
+    assert member_cache_flags(["joined"], intents).joined
@@ -0,0 +1,18 @@
+import asyncio
+
+from discord.gateway import DiscordWebSocket
+from discord.http import Route
+
+import bot as bot_module
+from benchmarks import cluster_check
+
+
+def test_two_clusters_split_guilds_and_share_the_status_probe(monkeypatch):
+    # The check points discord.py at the simulator and edits the config for the clusters; undo both afterwards.
+    monkeypatch.setattr(Route, "BASE", Route.BASE)
+    monkeypatch.setattr(DiscordWebSocket, "DEFAULT_GATEWAY", DiscordWebSocket.DEFAULT_GATEWAY)
+    for key in ("database", "metrics"):
+        monkeypatch.setitem(bot_module.config, key, bot_module.config.get(key))
+
+    failures = asyncio.run(cluster_check.run(cluster_check.parse_args(["--guilds", "10", "--ticks", "3"])))
+    assert failures == []
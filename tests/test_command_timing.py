@@ -0,0 +1,39 @@
+import asyncio
+import time
+
+import discord
+
+import bot as bot_module
+from benchmarks.payloads import guild_payload, message_payload, user_payload
+
+
+def test_time_before_first_await_is_counted():
+    async def run():
+        bot = bot_module.DiscordBot()
+        state = bot._connection
+        state.user = discord.ClientUser(state=state, data=user_payload(1))
+        state._add_guild_from_data(guild_payload(0, 5))
+        bot.refresh_prefix_filter()
+
+        @bot.command()
+        async def busy(ctx):
+            # CPU work before the first await, then a short await.
+            until = time.perf_counter() + 0.2
+            while time.perf_counter() < until:
+                pass
+            await asyncio.sleep(0.01)
+
+        data = message_payload(0, 0, 5, content=f"{bot.config['prefix']}busy")
+        channel = state._get_guild(int(data["guild_id"])).get_channel(int(data["channel_id"]))
+        message = discord.Message(state=state, channel=channel, data=data)
+
+        async with bot:
+            await bot.process_commands(message)
+            # Let the dispatched on_command_completion task run.
+            await asyncio.sleep(0.05)
+        return bot.metrics.histograms("ventra_command_duration_seconds")
+
+    histograms = asyncio.run(run())
+    histogram = histograms[(("command", "busy"),)]
+    assert histogram.count == 1
+    assert histogram.sum >= 0.2
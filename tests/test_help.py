@@ -0,0 +1,51 @@
+import asyncio
+
+import bot as bot_module
+from cogs.general import FIELD_VALUE_LIMIT, General
+
+
+def make_cog(index: list) -> General:
+    cog = General(bot_module.DiscordBot())
+    cog.command_index = lambda: index
+    return cog
+
+
+def test_large_cog_is_split_across_fields_and_pages():
+    lines = [f"/command{number} - " + "does something useful " * 3 for number in range(300)]
+    pages = make_cog([("Big", lines)]).help_pages()
+
+    fields = [field for page in pages for field in page.fields]
+    assert len(pages) > 1
+    assert all(len(field.value) <= FIELD_VALUE_LIMIT for field in fields)
+    assert all(len(page) <= 6000 and len(page.fields) <= 25 for page in pages)
+    shown = [line for field in fields for line in field.value.strip("`").split("\n")]
+    assert shown == lines
+    assert fields[0].name == "Big" and fields[1].name == "Big (cont.)"
+
+
+def test_over_long_line_is_truncated_to_fit():
+    values = General.field_values(["/long - " + "x" * 2000])
+    assert len(values) == 1 and len(values[0]) == FIELD_VALUE_LIMIT
+
+
+def test_search_results_are_paged():
+    lines = [f"/match{number} - " + "y" * 60 for number in range(200)]
+    pages = make_cog([]).build_pages("Commands matching `match`:", [("Search", lines)], "use /help match <page> for more")
+    assert len(pages) > 1
+    assert pages[-1].footer.text == f"Page {len(pages)}/{len(pages)} - use /help match <page> for more"
+
+
+class StubContext:
+    def __init__(self) -> None:
+        self.sent = []
+
+    async def send(self, **kwargs) -> None:
+        self.sent.append(kwargs["embed"])
+
+
+def test_numeric_query_is_a_page_of_the_full_list():
+    lines = [f"/command{number} - " + "does something useful " * 3 for number in range(300)]
+    cog = make_cog([("Big", lines)])
+    context = StubContext()
+    asyncio.run(cog.help.callback(cog, context, "2"))
+    assert context.sent == [cog.help_pages()[1]]
@@ -0,0 +1,156 @@
+import asyncio
+import time
+
+import bot as bot_module
+from cogs.utility import Poll, PollView, Utility
+from utils import runtime
+from utils.database import Database
+
+
+class StubMessage:
+    def __init__(self, edits: list) -> None:
+        self.edits = edits
+
+    async def edit(self, **kwargs) -> None:
+        self.edits.append(kwargs)
+
+
+class StubChannel:
+    def __init__(self, edits: list) -> None:
+        self.edits = edits
+
+    def get_partial_message(self, message_id: int) -> StubMessage:
+        return StubMessage(self.edits)
+
+
+async def make_cog(tmp_path, **options) -> Utility:
+    bot = bot_module.DiscordBot(**options)
+    bot.database = Database(tmp_path / "polls.db")
+    await bot.database.connect()
+    return Utility(bot)
+
+
+async def store_poll(cog: Utility, poll: Poll) -> None:
+    await cog.bot.database.execute(
+        "INSERT INTO polls (poll_id, guild_id, channel_id, message_id, title, options, author, author_id, ends_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (poll.poll_id, poll.guild_id, poll.channel_id, poll.message_id, poll.title, runtime.dumps(poll.options),
+         poll.author, poll.author_id, poll.ends_at)
+    )
+
+
+def test_expired_polls_are_closed_not_restored(tmp_path):
+    async def run():
+        cog = await make_cog(tmp_path)
+        options = [("Yes", "👍"), ("No", "👎")]
+        await store_poll(cog, Poll("open", None, 1, 10, "Open?", options, "author", 5, time.time() + 600))
+        await store_poll(cog, Poll("expired", None, 1, 11, "Expired?", options, "author", 5, time.time() - 1))
+        await cog.bot.database.execute("INSERT INTO poll_votes (poll_id, user_id, option) VALUES ('expired', 7, 0)")
+
+        await cog.cog_load()
+        restored = [view for view in cog.bot.persistent_views]
+        assert cog.polls["expired"].view is None
+        edits = []
+        cog.bot.get_partial_messageable = lambda channel_id: StubChannel(edits)
+        await cog.close_expired()
+        rows = await cog.bot.database.execute("SELECT poll_id FROM polls")
+        votes = await cog.bot.database.execute("SELECT poll_id FROM poll_votes")
+        await cog.cog_unload()
+        await cog.bot.database.close()
+        return restored, edits, rows, votes, cog.polls
+
+    restored, edits, rows, votes, polls = asyncio.run(run())
+    assert [view.children[0].poll.poll_id for view in restored] == ["open"]
+    assert len(edits) == 1 and edits[0]["view"] is None
+    assert "closed" in edits[0]["embed"].description
+    assert rows == [("open",)] and votes == []
+    assert list(polls) == ["open"]
+
+
+def test_only_polls_of_this_shards_guilds_are_restored(tmp_path):
+    async def run():
+        # Shard 1 of 2: guild 1 << 22 is on shard 1, guild 2 << 22 on shard 0.
+        cog = await make_cog(tmp_path, shard_id=1, shard_count=2)
+        options = [("Yes", "👍"), ("No", "👎")]
+        await store_poll(cog, Poll("own", 1 << 22, 1, 10, "Own?", options, "author", 5))
+        await store_poll(cog, Poll("other", 2 << 22, 1, 11, "Other?", options, "author", 5, time.time() - 1))
+        await store_poll(cog, Poll("dm", None, 1, 12, "DM?", options, "author", 5))
+        await cog.cog_load()
+        polls = sorted(cog.polls)
+        await cog.close_expired()
+        rows = await cog.bot.database.execute("SELECT poll_id FROM polls ORDER BY poll_id")
+        await cog.cog_unload()
+        await cog.bot.database.close()
+        return polls, rows
+
+    polls, rows = asyncio.run(run())
+    assert polls == ["own"]
+    # The other shard's expired poll is left for the cluster that owns it.
+    assert rows == [("dm",), ("other",), ("own",)]
+
+
+def test_unload_keeps_votes_from_an_interrupted_checkpoint(tmp_path):
+    async def run():
+        cog = await make_cog(tmp_path)
+        poll = Poll("poll", None, 1, 10, "Open?", [("Yes", "👍"), ("No", "👎")], "author", 5)
+        cog.polls[poll.poll_id] = poll
+        await store_poll(cog, poll)
+
+        executemany = cog.bot.database.executemany
+
+        async def slow_executemany(sql, rows):
+            await asyncio.sleep(0.05)
+            await executemany(sql, rows)
+
+        cog.bot.database.executemany = slow_executemany
+        poll.vote(7, 0)
+        poll.vote(8, 1)
+        cog.schedule_flush(poll)
+        # Unload while the flush is still writing the votes.
+        await asyncio.sleep(0.01)
+        await cog.cog_unload()
+        votes = await cog.bot.database.execute("SELECT user_id, option FROM poll_votes ORDER BY user_id")
+        await cog.bot.database.close()
+        return votes
+
+    assert asyncio.run(run()) == [(7, 0), (8, 1)]
+
+
+class StubResponse:
+    def __init__(self) -> None:
+        self.edits = []
+        self.messages = []
+
+    async def edit_message(self, **kwargs) -> None:
+        self.edits.append(kwargs)
+
+    async def send_message(self, content: str, **kwargs) -> None:
+        self.messages.append(content)
+
+
+class StubInteraction:
+    def __init__(self, client, user_id: int) -> None:
+        self.client = client
+        self.user = type("User", (), {"id": user_id})()
+        self.response = StubResponse()
+
+
+def test_vote_after_end_time_closes_the_poll(tmp_path):
+    async def run():
+        cog = await make_cog(tmp_path)
+        await cog.bot.add_cog(cog)
+        poll = Poll("poll", None, 1, 10, "Ended?", [("Yes", "👍"), ("No", "👎")], "author", 5, time.time() - 1)
+        cog.polls[poll.poll_id] = poll
+        await store_poll(cog, poll)
+
+        interaction = StubInteraction(cog.bot, 7)
+        await PollView(poll).children[0].callback(interaction)
+        rows = await cog.bot.database.execute("SELECT poll_id FROM polls")
+        await cog.bot.remove_cog(cog.qualified_name)
+        await cog.bot.database.close()
+        return poll, interaction.response, rows
+
+    poll, response, rows = asyncio.run(run())
+    assert poll.closed and poll.votes == {}
+    assert len(response.edits) == 1 and response.edits[0]["view"] is None
+    assert rows == []
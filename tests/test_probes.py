@@ -0,0 +1,39 @@
+import asyncio
+import sys
+
+import pytest
+
+from benchmarks.minecraft_sim import FakeMinecraftServer
+from utils import probes
+from utils.metrics import MetricsRegistry
+from utils.probes import StatusProber
+
+
+def test_handshake_names_the_resolved_host():
+    async def run():
+        server = FakeMinecraftServer(expect_host="localhost")
+        port = await server.start("127.0.0.1")
+        prober = StatusProber(MetricsRegistry())
+        try:
+            status = await prober.status(f"localhost:{port}")
+            with pytest.raises(OSError):
+                # A handshake carrying the bare IP is dropped by the forced-host check.
+                await prober.race([("127.0.0.1", port)])
+        finally:
+            await server.stop()
+        assert status.players.online == 12
+        assert server.handshakes == [("localhost", port), ("127.0.0.1", port)]
+
+    asyncio.run(run())
+
+
+def test_missing_mcstatus_internals_are_not_an_offline_server(monkeypatch):
+    probes.mcstatus_api.cache_clear()
+    monkeypatch.setitem(sys.modules, "mcstatus._protocol.java_client", None)
+    prober = StatusProber(MetricsRegistry())
+    try:
+        with pytest.raises(ImportError):
+            asyncio.run(prober.status("127.0.0.1:25565"))
+    finally:
+        probes.mcstatus_api.cache_clear()
+    assert not prober.metrics.counters("ventra_probe_attempts_total")
@@ -0,0 +1,92 @@
+import asyncio
+
+import discord
+import pytest
+from discord.ext import commands
+
+import bot as bot_module
+from utils.ratelimit import RateLimiter, TokenBucket
+
+
+class StubResponse:
+    def __init__(self) -> None:
+        self.sent = []
+
+    async def send_message(self, **kwargs) -> None:
+        self.sent.append(kwargs)
+
+
+class StubCommand:
+    qualified_name = "advancedpoll"
+
+
+class StubInteraction:
+    def __init__(self, kind: discord.InteractionType) -> None:
+        self.type = kind
+        self.extras = {}
+        self.command = StubCommand()
+        self.user = discord.Object(7)
+        self.guild_id = 1
+        self.response = StubResponse()
+
+
+def test_autocomplete_is_not_timed_or_rate_limited():
+    async def run():
+        bot = bot_module.DiscordBot()
+        bot.rate_limiter = RateLimiter({"commands": {"advancedpoll": {"user": [2, 60]}}})
+        keystrokes = [StubInteraction(discord.InteractionType.autocomplete) for _ in range(5)]
+        allowed = [await bot.tree.interaction_check(interaction) for interaction in keystrokes]
+        invocations = [StubInteraction(discord.InteractionType.application_command) for _ in range(3)]
+        invoked = [await bot.tree.interaction_check(interaction) for interaction in invocations]
+        return keystrokes, allowed, invocations, invoked
+
+    keystrokes, allowed, invocations, invoked = asyncio.run(run())
+    assert all(allowed)
+    assert not any(interaction.extras or interaction.response.sent for interaction in keystrokes)
+    # Both uses of the budget are still there for the actual invocations.
+    assert invoked == [True, True, False]
+    assert all("started_at" in interaction.extras for interaction in invocations)
+    assert len(invocations[-1].response.sent) == 1
+
+
+def test_bucket_refills_at_rate_per_seconds():
+    bucket = TokenBucket(3, 30)
+    assert [bucket.acquire("key", now=100.0) for _ in range(4)] == [0, 0, 0, 10.0]
+    # One token per 10 seconds: 4 seconds later 6 remain, and nothing was taken by the refusal.
+    assert bucket.retry_after("key", now=104.0) == pytest.approx(6.0)
+    assert bucket.acquire("key", now=110.0) == 0
+    assert bucket.retry_after("key", now=110.0) == pytest.approx(10.0)
+    # A long pause refills to ``rate`` and no further.
+    assert [bucket.acquire("key", now=1000.0) for _ in range(4)] == [0, 0, 0, 10.0]
+
+
+def test_command_takes_tokens_from_all_scopes_or_none():
+    limiter = RateLimiter({"commands": {"status": {"user": [3, 30], "guild": [2, 60]}}})
+    assert limiter.check_command("status", 1, 10) is None
+    assert limiter.check_command("status", 2, 10) is None
+    cooldown = limiter.check_command("status", 1, 10)
+    assert cooldown is not None and cooldown.type is commands.BucketType.guild
+    # The refused call above did not spend user 1's token: two are left in another guild.
+    assert limiter.check_command("status", 1, 20) is None
+    assert limiter.check_command("status", 1, 20) is None
+    cooldown = limiter.check_command("status", 1, 20)
+    assert cooldown is not None and cooldown.type is commands.BucketType.user
+    assert limiter.check_command("unlimited", 1, 10) is None
+
+
+def test_direct_messages_get_a_guild_bucket_per_user():
+    limiter = RateLimiter({"commands": {"status": {"guild": [1, 60]}}})
+    assert limiter.check_command("status", 1, None) is None
+    assert limiter.check_command("status", 2, None) is None
+    assert limiter.check_command("status", 1, None) is not None
+    assert set(limiter.commands["status"]["guild"]._buckets) == {("dm", 1), ("dm", 2)}
+
+
+def test_sweep_keeps_the_table_bounded():
+    bucket = TokenBucket(1, 10)
+    for key in range(5000):
+        # Keys arrive one per second, so only the last ten seconds' worth are still refilling.
+        bucket.consume(key, now=float(key))
+        assert len(bucket) <= 1024
+    bucket.sweep(now=5000.0)
+    assert len(bucket) == 9
@@ -0,0 +1,6 @@
+"""
+Shared helpers used by the bot core and the cogs.
+
+Anything in here is plain Python (no ``setup`` entry point) so it must live
+outside of ``cogs/``, which is auto-loaded as extensions.
+"""
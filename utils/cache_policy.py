@@ -0,0 +1,99 @@
+"""
+Config-driven intents and cache settings.
+
+``config.json`` picks a named profile under ``cache.profile`` and can override
+any of its keys next to it:
+
+    "cache": {"profile": "low_memory", "max_messages": 100}
+"""
+
+from typing import Any, Dict
+
+import discord
+
+CACHE_PROFILES: Dict[str, Dict[str, Any]] = {
+    # discord.py's own defaults.
+    "default": {
+        "members": "default",
+        "max_messages": 1000,
+        # None lets discord.py decide (it chunks only when the members intent is on).
+        "chunk_guilds_at_startup": None,
+        "slash_only": False,
+    },
+    # Keeps prefix commands working but drops caches none of our commands read.
+    "low_memory": {
+        "members": "none",
+        "max_messages": None,
+        "chunk_guilds_at_startup": False,
+        "slash_only": False,
+    },
+    # Also drops the privileged message_content intent; prefix commands only
+    # work by mentioning the bot.
+    "slash_only": {
+        "members": "none",
+        "max_messages": None,
+        "chunk_guilds_at_startup": False,
+        "slash_only": True,
+    },
+}
+
+
+def resolve_cache_policy(cache_config: Dict[str, Any] | None) -> Dict[str, Any]:
+    """
+    Merges the selected profile with any keys overridden in the config.
+    """
+    cache_config = dict(cache_config or {})
+    profile_name = cache_config.pop("profile", "default")
+    if profile_name not in CACHE_PROFILES:
+        raise ValueError(f"Unknown cache profile '{profile_name}'. Expected one of: {', '.join(CACHE_PROFILES)}.")
+    return {**CACHE_PROFILES[profile_name], **cache_config}
+
+
+def member_cache_flags(setting: str | list, intents: discord.Intents) -> discord.MemberCacheFlags:
+    """
+    Turns ``"default"``, ``"none"``, ``"all"`` or a list of flag names
+    (``["voice", "joined"]``) into ``MemberCacheFlags``.
+    """
+    if setting == "default":
+        return discord.MemberCacheFlags.from_intents(intents)
+    if setting == "none":
+        return discord.MemberCacheFlags.none()
+    if setting == "all":
+        flags = discord.MemberCacheFlags.all()
+    else:
+        if isinstance(setting, str):
+            raise ValueError(f"Unknown cache.members setting '{setting}'. Expected \"default\", \"none\", \"all\" or a list of flag names.")
+        unknown = [name for name in setting if name not in discord.MemberCacheFlags.VALID_FLAGS]
+        if unknown:
+            raise ValueError(
+                f"Unknown cache.members flag(s): {', '.join(unknown)}. "
+                f"Expected any of: {', '.join(discord.MemberCacheFlags.VALID_FLAGS)}."
+            )
+        # MemberCacheFlags() starts with every flag on, so build up from none.
+        flags = discord.MemberCacheFlags.none()
+        for name in setting:
+            setattr(flags, name, True)
+
+    # Flags like "joined" need an intent; discord.py would only fail later, when the client is created.
+    available = discord.MemberCacheFlags.from_intents(intents)
+    missing = [name for name, enabled in flags if enabled and not getattr(available, name)]
+    if missing:
+        raise ValueError(f"cache.members flag(s) {', '.join(missing)} need the members intent, which is not enabled.")
+    return flags
+
+
+def client_options(policy: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Builds the keyword arguments for ``discord.Client`` (intents and cache
+    settings) from a resolved policy.
+    """
+    intents = discord.Intents.default()
+    intents.message_content = not policy["slash_only"]
+    options = {
+        "intents": intents,
+        "member_cache_flags": member_cache_flags(policy["members"], intents),
+        "max_messages": policy["max_messages"],
+    }
+    if policy["chunk_guilds_at_startup"] is not None:
+        options["chunk_guilds_at_startup"] = policy["chunk_guilds_at_startup"]
+    return options
@@ -0,0 +1,88 @@
+"""
+Small SQLite store for state that has to survive restarts.
+
+The bot loads what it needs into memory at startup and writes changes
+through; every query runs in a worker thread so the event loop never waits on
+disk.
+"""
+
+import asyncio
+import pathlib
+import sqlite3
+import threading
+from typing import Any, Iterable, List
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS guild_prefixes (
+    guild_id INTEGER PRIMARY KEY,
+    prefix TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS command_sync (
+    scope TEXT PRIMARY KEY,
+    hash TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS polls (
+    poll_id TEXT PRIMARY KEY,
+    guild_id INTEGER,
+    channel_id INTEGER NOT NULL,
+    message_id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    options TEXT NOT NULL,
+    author TEXT NOT NULL,
+    author_id INTEGER NOT NULL DEFAULT 0,
+    ends_at REAL
+);
+
+CREATE TABLE IF NOT EXISTS poll_votes (
+    poll_id TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    option INTEGER NOT NULL,
+    PRIMARY KEY (poll_id, user_id)
+);
+"""
+
+
+class Database:
+    def __init__(self, path: str | pathlib.Path) -> None:
+        self.path = pathlib.Path(path)
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    async def connect(self) -> None:
+        await asyncio.to_thread(self._connect)
+
+    def _connect(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.executescript(SCHEMA)
+        self._connection.commit()
+
+    def _execute(self, sql: str, parameters: Iterable[Any]) -> List[tuple]:
+        with self._lock:
+            rows = self._connection.execute(sql, tuple(parameters)).fetchall()
+            self._connection.commit()
+            return rows
+
+    async def execute(self, sql: str, parameters: Iterable[Any] = ()) -> List[tuple]:
+        """
+        Runs a single statement in a worker thread, commits, and returns any rows.
+        """
+        return await asyncio.to_thread(self._execute, sql, parameters)
+
+    def _executemany(self, sql: str, rows: Iterable[Iterable[Any]]) -> None:
+        with self._lock:
+            self._connection.executemany(sql, [tuple(row) for row in rows])
+            self._connection.commit()
+
+    async def executemany(self, sql: str, rows: Iterable[Iterable[Any]]) -> None:
+        """
+        Runs a statement once per row in a single transaction, in a worker thread.
+        """
+        await asyncio.to_thread(self._executemany, sql, rows)
+
+    async def close(self) -> None:
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            await asyncio.to_thread(connection.close)
@@ -0,0 +1,99 @@
+"""
+Non-blocking logging setup.
+
+Every logger in the process writes to a ``QueueHandler``; a ``QueueListener``
+thread does the formatting and the actual I/O so a slow stdout never stalls the
+event loop.
+"""
+
+import datetime
+import json
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+TEXT_FORMAT = "[{asctime}] [{levelname:<8}] {name}: {message}"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as a single JSON object per line.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": datetime.datetime.fromtimestamp(record.created, tz=datetime.timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    ``QueueHandler.prepare`` formats the record in the calling thread. Records
+    are only consumed in-process here, so pass them through untouched and let
+    the listener thread do all of the formatting.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Lets through one in every ``1 / rate`` records below WARNING. Warnings and
+    errors are never dropped.
+    """
+
+    def __init__(self, rate: float) -> None:
+        super().__init__()
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self.seen = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        if not self.every:
+            return False
+        self.seen += 1
+        return self.seen % self.every == 0
+
+
+def setup_logging(config: Optional[dict] = None) -> QueueListener:
+    """
+    Configures the root logger from the ``logging`` section of ``config.json``
+    and starts the background listener. The caller is responsible for calling
+    ``stop()`` on the returned listener during shutdown so queued records are
+    flushed.
+    """
+    config = config or {}
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if config.get("json"):
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter(TEXT_FORMAT, DATE_FORMAT, style="{"))
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers.clear()
+    root.addHandler(DeferredQueueHandler(log_queue))
+    root.setLevel(config.get("level", "INFO"))
+
+    for name, level in config.get("levels", {}).items():
+        logging.getLogger(name).setLevel(level)
+
+    for name, rate in config.get("sample_rates", {}).items():
+        if rate < 1:
+            logging.getLogger(name).addFilter(SamplingFilter(rate))
+
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    return listener
@@ -0,0 +1,82 @@
+"""
+Event loop watchdog.
+
+An asyncio task measures how late its own wake-ups are (scheduling lag) and
+records it in a histogram. A separate thread watches the task's heartbeat;
+when the loop has not come back for longer than the threshold it grabs the
+loop thread's current stack, which is whatever is blocking it right now.
+"""
+
+import asyncio
+import collections
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Deque, Optional, Tuple
+
+from utils.metrics import Histogram, MetricsRegistry
+
+logger = logging.getLogger("ventra.loop")
+
+LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class LoopMonitor:
+    def __init__(self, metrics: MetricsRegistry, interval: float = 0.25, threshold: float = 0.25, max_stalls: int = 10) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self.histogram: Histogram = metrics.histogram("ventra_event_loop_lag_seconds", buckets=LAG_BUCKETS)
+        metrics.describe("ventra_event_loop_lag_seconds", "How late the event loop woke up a sleeping task.")
+        self.max_lag = 0.0
+        # (time.time() when detected, seconds blocked so far, formatted stack)
+        self.stalls: Deque[Tuple[float, float, str]] = collections.deque(maxlen=max_stalls)
+
+        self._heartbeat = time.perf_counter()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.perf_counter()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._measure(), name="ventra-loop-monitor")
+        self._thread = threading.Thread(target=self._watch, name="ventra-loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _measure(self) -> None:
+        while True:
+            before = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            lag = max(0.0, now - before - self.interval)
+            self.histogram.observe(lag)
+            if lag > self.max_lag:
+                self.max_lag = lag
+            self._heartbeat = now
+
+    def _watch(self) -> None:
+        reported_heartbeat = None
+        while not self._stop.wait(self.threshold / 2):
+            heartbeat = self._heartbeat
+            blocked_for = time.perf_counter() - heartbeat - self.interval
+            if blocked_for < self.threshold or heartbeat == reported_heartbeat:
+                continue
+
+            # Only report each stall once, while it is still happening.
+            reported_heartbeat = heartbeat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            self.stalls.append((time.time(), blocked_for, stack))
+            logger.warning("Event loop blocked for at least %.3fs. Current stack:\n%s", blocked_for, stack)
@@ -0,0 +1,88 @@
+"""
+Memory inspection helpers for the running bot.
+
+``tracemalloc`` is only started when the first snapshot is taken and can be
+stopped again, so normal operation pays nothing for it.
+"""
+
+import asyncio
+import collections
+import gc
+import tracemalloc
+from typing import Dict, List, Tuple
+
+import aiohttp
+import discord
+
+# Allocations made by the tooling itself would otherwise top every diff.
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class MemoryTracker:
+    def __init__(self, max_snapshots: int = 5, frames: int = 10) -> None:
+        self.max_snapshots = max_snapshots
+        self.frames = frames
+        self.snapshots: List[tracemalloc.Snapshot] = []
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    async def snapshot(self) -> int:
+        """
+        Takes a snapshot (starting tracemalloc if needed) and returns its number.
+        Only the most recent ``max_snapshots`` snapshots are kept.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        snapshot = await asyncio.to_thread(tracemalloc.take_snapshot)
+        self.snapshots.append(snapshot.filter_traces(_IGNORED))
+        del self.snapshots[:-self.max_snapshots]
+        return len(self.snapshots)
+
+    async def diff(self, first: int = -2, second: int = -1, limit: int = 10) -> List[str]:
+        """
+        Compares two snapshots (1-based numbers, or negative indexes) and returns
+        the top growth sites formatted one per line.
+        """
+        old = self.snapshots[first - 1 if first > 0 else first]
+        new = self.snapshots[second - 1 if second > 0 else second]
+        stats = await asyncio.to_thread(new.compare_to, old, "lineno")
+        return [str(stat) for stat in stats[:limit]]
+
+    def stop(self) -> None:
+        self.snapshots.clear()
+        tracemalloc.stop()
+
+
+def cache_counts(bot: discord.Client) -> Dict[str, int]:
+    """
+    Returns the sizes of the caches most likely to grow over time.
+    """
+    return {
+        "Guilds": len(bot.guilds),
+        "Cached Members": sum(len(guild.members) for guild in bot.guilds),
+        "Cached Users": len(bot.users),
+        "Cached Messages": len(bot.cached_messages),
+        "Persistent Views": len(bot.persistent_views),
+        "Tasks": len(asyncio.all_tasks()),
+    }
+
+
+def live_object_counts() -> List[Tuple[str, int]]:
+    """
+    Counts live ``discord.ui.View`` instances by class and open aiohttp sessions.
+    Walks every tracked object, so run it off the event loop.
+    """
+    counts: collections.Counter = collections.Counter()
+    for obj in gc.get_objects():
+        if isinstance(obj, discord.ui.View):
+            counts[type(obj).__name__] += 1
+        elif isinstance(obj, aiohttp.ClientSession) and not obj.closed:
+            counts["aiohttp.ClientSession (open)"] += 1
+    return counts.most_common()
@@ -0,0 +1,207 @@
+"""
+Deadline-bounded Minecraft server status probes.
+
+``StatusProber.status`` gives each probe one overall deadline that covers the
+SRV lookup, name resolution, connecting and the status exchange, instead of
+mcstatus's per-step timeouts multiplied by its retries. Within that deadline:
+
+- the server's addresses are raced Happy Eyeballs style (RFC 8305): IPv6 and
+  IPv4 alternate, a new connection attempt starts every ``stagger`` seconds or
+  as soon as the previous one fails, and the first status to arrive wins;
+- addresses that answered recently are tried first (RFC 8305's cached
+  preference), so a dead address family only costs the first probe;
+- with ``hedge`` on, one extra attempt goes to the preferred address when
+  nothing has answered by the running p95 of recent probes. That costs about
+  5% more connections and cuts off the slow tail (a lost SYN, a server
+  stalling on one connection).
+"""
+
+import asyncio
+import collections
+import functools
+import socket
+import time
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+from utils.metrics import MetricsRegistry
+
+Address = Tuple[str, int]
+
+PROBE_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# How many recently answering addresses to remember.
+ANSWERED_SIZE = 256
+
+
+class McStatus(NamedTuple):
+    JavaServer: Any
+    Address: Any
+    TCPAsyncSocketConnection: Any
+    AsyncJavaClient: Any
+
+
+@functools.cache
+def mcstatus_api() -> McStatus:
+    """
+    Imports the parts of mcstatus the prober uses, once (mcstatus is slow to
+    import, so not at startup). Connecting to one IP while naming the
+    hostname in the handshake needs mcstatus internals that only exist in
+    the version range pinned in requirements.txt. With another layout this
+    raises ``ImportError`` to the caller instead of every attempt failing
+    like an unreachable server.
+    """
+    from mcstatus import JavaServer
+    from mcstatus._net.address import Address
+    from mcstatus._protocol.io.connection import TCPAsyncSocketConnection
+    from mcstatus._protocol.java_client import AsyncJavaClient
+
+    return McStatus(JavaServer, Address, TCPAsyncSocketConnection, AsyncJavaClient)
+
+
+def interleave(addresses: List[Tuple[int, Address]]) -> List[Address]:
+    """
+    Orders ``(family, address)`` pairs so address families alternate, starting
+    with the family of the first (preferred) one. Duplicates are dropped.
+    """
+    by_family = collections.OrderedDict()
+    for family, address in addresses:
+        if address not in by_family.setdefault(family, []):
+            by_family[family].append(address)
+    queues = [collections.deque(family) for family in by_family.values()]
+    ordered = []
+    while any(queues):
+        for queue in queues:
+            if queue:
+                ordered.append(queue.popleft())
+    return ordered
+
+
+class StatusProber:
+    def __init__(self, metrics: MetricsRegistry, deadline: float = 2.5, stagger: float = 0.25,
+                 hedge: bool = True, window: int = 200, min_samples: int = 20) -> None:
+        self.metrics = metrics
+        self.deadline = deadline
+        self.stagger = stagger
+        self.hedge = hedge
+        self.min_samples = min_samples
+        # Durations of recent successful attempts, for the running p95.
+        self.samples = collections.deque(maxlen=window)
+        # Addresses that answered recently, most recent last.
+        self.answered = collections.OrderedDict()
+        metrics.describe("ventra_probe_seconds", "Minecraft status probe time by result.")
+        metrics.describe("ventra_probe_attempts_total", "Connection attempts made by status probes, by kind.")
+
+    def hedge_delay(self) -> Optional[float]:
+        """
+        The running p95 probe time, or ``None`` while hedging is off or there
+        are too few samples to trust it.
+        """
+        if not self.hedge or len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+    async def resolve(self, target: str) -> Tuple[Address, List[Address]]:
+        """
+        Resolves ``host[:port]`` (following SRV records like the game client)
+        to the server's ``(host, port)`` and the list of addresses to race.
+        """
+        server = await mcstatus_api().JavaServer.async_lookup(target, timeout=self.deadline)
+        host, port = server.address.host, server.address.port
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        return (host, port), interleave([(family, sockaddr[:2]) for family, _, _, _, sockaddr in infos])
+
+    async def attempt(self, address: Address, kind: str, server: Optional[Address] = None):
+        """
+        Connects to the IP in ``address`` but sends ``server`` (the hostname
+        and port that were resolved) in the handshake, like the game client.
+        Proxies such as TCPShield and BungeeCord forced hosts route on that
+        name and drop handshakes that carry a bare IP.
+        """
+        mcstatus = mcstatus_api()
+        self.metrics.inc("ventra_probe_attempts_total", (("kind", kind),))
+        started = time.monotonic()
+        try:
+            async with mcstatus.TCPAsyncSocketConnection(mcstatus.Address(*address), self.deadline) as connection:
+                client = mcstatus.AsyncJavaClient(connection, address=mcstatus.Address(*(server or address)), version=47)
+                await client.handshake()
+                status = await client.read_status()
+        except Exception:
+            self.answered.pop(address, None)
+            raise
+        self.samples.append(time.monotonic() - started)
+        self.answered[address] = None
+        self.answered.move_to_end(address)
+        if len(self.answered) > ANSWERED_SIZE:
+            self.answered.popitem(last=False)
+        return status
+
+    async def race(self, addresses: List[Address], server: Optional[Address] = None):
+        """
+        Runs staggered (and possibly hedged) attempts against ``addresses`` and
+        returns the first status that arrives. Every attempt hands ``server``
+        to the server in its handshake. Raises the last attempt's error if all
+        of them fail.
+        """
+        # Outside the attempts, so a broken mcstatus install isn't taken for a failed connection.
+        mcstatus_api()
+        loop = asyncio.get_running_loop()
+        addresses = sorted(addresses, key=lambda address: address not in self.answered)
+        queue = collections.deque(addresses)
+        attempts = set()
+        error: Optional[BaseException] = None
+        next_start = loop.time()
+        hedge_delay = self.hedge_delay()
+        hedge_at = next_start + hedge_delay if hedge_delay is not None and addresses else None
+        try:
+            while True:
+                now = loop.time()
+                if queue and now >= next_start:
+                    attempts.add(asyncio.create_task(self.attempt(queue.popleft(), "connect", server)))
+                    next_start = now + self.stagger
+                if hedge_at is not None and now >= hedge_at:
+                    attempts.add(asyncio.create_task(self.attempt(addresses[0], "hedge", server)))
+                    hedge_at = None
+                if not attempts:
+                    break
+
+                wake_times = [t for t in (next_start if queue else None, hedge_at) if t is not None]
+                timeout = max(0.0, min(wake_times) - loop.time()) if wake_times else None
+                done, attempts = await asyncio.wait(attempts, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                winner = None
+                for task in done:
+                    if task.exception() is None:
+                        winner = task
+                    else:
+                        error = task.exception()
+                        # A failed attempt doesn't wait out the stagger before the next one starts.
+                        next_start = loop.time()
+                if winner is not None:
+                    return winner.result()
+        finally:
+            for task in attempts:
+                task.cancel()
+        raise error or OSError("No addresses to probe")
+
+    async def status(self, target: str):
+        """
+        Probes ``target`` and returns mcstatus's ``JavaStatusResponse``.
+        Raises ``TimeoutError`` once the deadline passes, or the last
+        connection error if every address failed first. Raises
+        ``ImportError`` if mcstatus isn't usable (see ``mcstatus_api``).
+        """
+        mcstatus_api()
+        started = time.monotonic()
+        result = "error"
+        try:
+            async with asyncio.timeout(self.deadline):
+                server, addresses = await self.resolve(target)
+                status = await self.race(addresses, server)
+            result = "ok"
+            return status
+        except TimeoutError:
+            result = "timeout"
+            raise TimeoutError(f"No answer within {self.deadline:g}s") from None
+        finally:
+            self.metrics.histogram("ventra_probe_seconds", (("result", result),), PROBE_BUCKETS).observe(
+                time.monotonic() - started
+            )
@@ -0,0 +1,103 @@
+"""
+On-demand profiling of the running bot.
+
+Nothing here is active until ``start`` is called: the sampling mode spins up a
+thread that periodically reads the event loop thread's stack, and the
+``pstats`` mode enables ``cProfile`` on the loop thread. Stopping tears either
+down completely, so there is no overhead while the profiler is off.
+"""
+
+import collections
+import cProfile
+import marshal
+import os
+import sys
+import threading
+import time
+from typing import Counter, Optional, Tuple
+
+MODES = ("collapsed", "pstats")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class Profiler:
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self.mode: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.samples = 0
+
+        self._stacks: Counter[str] = collections.Counter()
+        self._target_thread_id: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._cprofile: Optional[cProfile.Profile] = None
+
+    @property
+    def running(self) -> bool:
+        return self.mode is not None
+
+    def start(self, mode: str = "collapsed") -> None:
+        """
+        Starts profiling the calling thread (the event loop thread when called
+        from a command).
+        """
+        if self.running:
+            raise RuntimeError("The profiler is already running.")
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiler mode '{mode}'. Expected one of: {', '.join(MODES)}.")
+
+        self.mode = mode
+        self.started_at = time.perf_counter()
+        self.samples = 0
+        self._stacks.clear()
+
+        if mode == "pstats":
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+            return
+
+        self._target_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, name="ventra-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Tuple[str, bytes]:
+        """
+        Stops profiling and returns ``(filename, data)`` ready to be attached to a message.
+        """
+        if not self.running:
+            raise RuntimeError("The profiler is not running.")
+
+        mode, self.mode = self.mode, None
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+
+        if mode == "pstats":
+            self._cprofile.disable()
+            self._cprofile.create_stats()
+            data = marshal.dumps(self._cprofile.stats)
+            self._cprofile = None
+            return f"profile-{stamp}.pstats", data
+
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        lines = [f"{stack} {count}" for stack, count in self._stacks.most_common()]
+        return f"profile-{stamp}.collapsed.txt", "\n".join(lines).encode("utf-8")
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target_thread_id)
+            if frame is None:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            labels.reverse()
+            self._stacks[";".join(labels)] += 1
+            self.samples += 1
@@ -0,0 +1,123 @@
+"""
+Token-bucket rate limiting shared by every command.
+
+Buckets are stored as ``key -> (tokens, last_update)`` tuples and are never
+expired eagerly: a bucket left alone for ``per`` seconds has refilled
+completely, which is the same as not existing, so such buckets are dropped in
+an occasional sweep once the table has grown.
+"""
+
+import time
+from typing import Dict, Hashable, Optional, Tuple
+
+from discord.ext import commands
+
+SCOPES = {
+    "user": commands.BucketType.user,
+    "guild": commands.BucketType.guild,
+    "global": commands.BucketType.default,
+}
+
+
+class TokenBucket:
+    __slots__ = ("rate", "per", "_refill", "_buckets", "_sweep_at")
+
+    def __init__(self, rate: int, per: float) -> None:
+        self.rate = rate
+        self.per = per
+        self._refill = rate / per
+        self._buckets: Dict[Hashable, Tuple[float, float]] = {}
+        self._sweep_at = 1024
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _tokens(self, key: Hashable, now: float) -> float:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return self.rate
+        tokens, updated = bucket
+        return min(self.rate, tokens + (now - updated) * self._refill)
+
+    def retry_after(self, key: Hashable, now: Optional[float] = None) -> float:
+        """
+        Seconds until ``key`` has a token available (0 if it has one now).
+        """
+        now = time.monotonic() if now is None else now
+        tokens = self._tokens(key, now)
+        return 0.0 if tokens >= 1 else (1 - tokens) / self._refill
+
+    def consume(self, key: Hashable, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        self._buckets[key] = (self._tokens(key, now) - 1, now)
+        if len(self._buckets) >= self._sweep_at:
+            self.sweep(now)
+
+    def acquire(self, key: Hashable, now: Optional[float] = None) -> float:
+        """
+        Takes a token if one is available. Returns 0 on success, otherwise the
+        seconds to wait (and nothing is taken).
+        """
+        now = time.monotonic() if now is None else now
+        retry_after = self.retry_after(key, now)
+        if not retry_after:
+            self.consume(key, now)
+        return retry_after
+
+    def sweep(self, now: Optional[float] = None) -> None:
+        """
+        Drops buckets that have fully refilled.
+        """
+        now = time.monotonic() if now is None else now
+        cutoff = now - self.per
+        self._buckets = {key: bucket for key, bucket in self._buckets.items() if bucket[1] > cutoff}
+        self._sweep_at = max(1024, len(self._buckets) * 2)
+
+
+class RateLimiter:
+    """
+    Per-command buckets for each configured scope (user, guild, global), plus a
+    per-target budget for outbound probes. Built from the ``ratelimits``
+    section of config.json, where every limit is ``[uses, seconds]``.
+    """
+
+    def __init__(self, config: Optional[dict] = None) -> None:
+        config = config or {}
+        self.commands: Dict[str, Dict[str, TokenBucket]] = {
+            name: {scope: TokenBucket(*limit) for scope, limit in scopes.items() if scope in SCOPES}
+            for name, scopes in config.get("commands", {}).items()
+        }
+        probes = config.get("probes")
+        self.probes = TokenBucket(*probes) if probes else None
+
+    def check_command(self, name: str, user_id: int, guild_id: Optional[int]) -> Optional[commands.CommandOnCooldown]:
+        """
+        Takes a token from every bucket of the command. If any of them is empty
+        nothing is taken and the matching ``CommandOnCooldown`` is returned.
+        """
+        buckets = self.commands.get(name)
+        if not buckets:
+            return None
+
+        keys = {"user": user_id, "guild": guild_id if guild_id is not None else ("dm", user_id), "global": None}
+        now = time.monotonic()
+        for scope, bucket in buckets.items():
+            retry_after = bucket.retry_after(keys[scope], now)
+            if retry_after:
+                return commands.CommandOnCooldown(commands.Cooldown(bucket.rate, bucket.per), retry_after, SCOPES[scope])
+        for scope, bucket in buckets.items():
+            bucket.consume(keys[scope], now)
+        return None
+
+    def check_probe(self, target: str) -> Optional[commands.CommandOnCooldown]:
+        """
+        Takes a token from the probe budget of ``target`` (e.g. a server address).
+        """
+        if self.probes is None:
+            return None
+        retry_after = self.probes.acquire(target.lower())
+        if retry_after:
+            return commands.CommandOnCooldown(
+                commands.Cooldown(self.probes.rate, self.probes.per), retry_after, commands.BucketType.default
+            )
+        return None
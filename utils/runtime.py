@@ -0,0 +1,68 @@
+"""
+Optional high-performance runtime.
+
+With ``"fast_runtime": true`` in config.json the bot runs on uvloop and
+decodes JSON with orjson, if they are installed (``pip install -r
+requirements-fast.txt``). Either one missing falls back to the standard
+library without failing.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Coroutine
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+logger = logging.getLogger("ventra.runtime")
+
+_use_uvloop = False
+_use_orjson = False
+
+
+def enable_fast_runtime(enabled: bool = True) -> dict:
+    """
+    Switches the fast paths on (or off) and reports which ones are active.
+    """
+    global _use_uvloop, _use_orjson
+    _use_uvloop = enabled and uvloop is not None
+    _use_orjson = enabled and orjson is not None
+    if enabled and not (_use_uvloop and _use_orjson):
+        missing = [name for name, module in (("uvloop", uvloop), ("orjson", orjson)) if module is None]
+        logger.warning("Fast runtime requested but %s not installed, using the standard library instead.", " and ".join(missing))
+    return {"uvloop": _use_uvloop, "orjson": _use_orjson}
+
+
+def loads(data: str | bytes) -> Any:
+    """
+    ``json.loads``, or ``orjson.loads`` when the fast runtime is enabled.
+    Pass response bodies as ``bytes``: orjson parses UTF-8 directly, and a
+    ``str`` costs an extra decode.
+    """
+    if _use_orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    if _use_orjson:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
+
+
+def run(main: Coroutine) -> Any:
+    """
+    Runs ``main`` on uvloop when the fast runtime is enabled, otherwise on the
+    default asyncio loop.
+    """
+    if _use_uvloop:
+        return uvloop.run(main)
+    return asyncio.run(main)
@@ -0,0 +1,117 @@
+"""
+Central scheduler for background jobs.
+
+Cogs register periodic jobs here instead of running their own ``tasks.loop``.
+Every job gets:
+
+- no overlapping runs (a job's runs are strictly sequential),
+- missed-tick coalescing (a run that overruns skips to the next tick
+  boundary instead of firing a burst of catch-up runs),
+- optional per-job jitter so jobs don't fire in lockstep,
+- duration and scheduling-lag histograms in the bot's metrics registry.
+
+``rest_slot()`` is a shared concurrency budget that background jobs take
+around Discord REST calls, so they can't crowd out interactive commands.
+"""
+
+import asyncio
+import contextlib
+import logging
+import math
+import random
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+from utils.metrics import MetricsRegistry
+
+logger = logging.getLogger("ventra.scheduler")
+
+JOB_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+class Job:
+    def __init__(self, name: str, interval: float, callback: Callable[[], Awaitable[None]], jitter: float = 0.0) -> None:
+        self.name = name
+        self.interval = interval
+        self.callback = callback
+        self.jitter = jitter
+        self.task: Optional[asyncio.Task] = None
+        self.next_run: Optional[float] = None
+        self.last_duration: Optional[float] = None
+        self.runs = 0
+        self.skipped = 0
+
+
+class Scheduler:
+    def __init__(self, bot, metrics: MetricsRegistry, rest_concurrency: int = 4) -> None:
+        self.bot = bot
+        self.metrics = metrics
+        self.jobs: Dict[str, Job] = {}
+        self._rest = asyncio.Semaphore(rest_concurrency)
+        metrics.describe("ventra_job_duration_seconds", "Run time of background jobs.")
+        metrics.describe("ventra_job_lag_seconds", "How late background jobs started compared to their schedule.")
+        metrics.describe("ventra_job_skipped_ticks_total", "Ticks coalesced because the previous run overran.")
+        metrics.describe("ventra_job_errors_total", "Background job runs that raised.")
+
+    def add_job(self, name: str, interval: float, callback: Callable[[], Awaitable[None]], jitter: float = 0.0) -> Job:
+        """
+        Registers and starts a job running ``callback`` every ``interval``
+        seconds once the bot is ready. The first run happens right away (plus
+        jitter).
+        """
+        if name in self.jobs:
+            raise ValueError(f"A job named '{name}' is already registered.")
+        job = Job(name, interval, callback, jitter)
+        job.task = asyncio.create_task(self._run(job), name=f"ventra-job:{name}")
+        self.jobs[name] = job
+        return job
+
+    def remove_job(self, name: str) -> None:
+        job = self.jobs.pop(name, None)
+        if job is not None and job.task is not None:
+            job.task.cancel()
+
+    def stop(self) -> None:
+        for name in list(self.jobs):
+            self.remove_job(name)
+
+    @contextlib.asynccontextmanager
+    async def rest_slot(self):
+        """
+        Hold one of the shared background REST slots for the duration of the block.
+        """
+        async with self._rest:
+            yield
+
+    async def _run(self, job: Job) -> None:
+        await self.bot.wait_until_ready()
+        labels = (("job", job.name),)
+        duration_histogram = self.metrics.histogram("ventra_job_duration_seconds", labels, JOB_BUCKETS)
+        lag_histogram = self.metrics.histogram("ventra_job_lag_seconds", labels, JOB_BUCKETS)
+
+        tick = time.monotonic()
+        while True:
+            job.next_run = tick + random.uniform(0, job.jitter)
+            await asyncio.sleep(max(0.0, job.next_run - time.monotonic()))
+
+            started = time.monotonic()
+            lag_histogram.observe(started - job.next_run)
+            try:
+                await job.callback()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.metrics.inc("ventra_job_errors_total", labels)
+                logger.exception("Background job %s failed", job.name)
+            finished = time.monotonic()
+            job.last_duration = finished - started
+            job.runs += 1
+            duration_histogram.observe(job.last_duration)
+
+            tick += job.interval
+            if tick <= finished:
+                # Overran one or more ticks: run once at the next boundary instead of catching up.
+                missed = math.ceil((finished - tick) / job.interval)
+                tick += missed * job.interval
+                job.skipped += missed
+                self.metrics.inc("ventra_job_skipped_ticks_total", labels, missed)
@@ -0,0 +1,78 @@
+"""
+Short-lived results shared between shard clusters.
+
+In a single process this is a plain dict. When the bot is started through
+``launcher.py`` every cluster gets the same ``multiprocessing.Manager`` dict and
+lock, so a result fetched by one cluster (a Minecraft status probe, the
+Modrinth version list, ...) is reused by the others instead of being fetched
+again.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+# How long a cluster may hold the right to refresh a key before others give up
+# waiting on it and refresh it themselves.
+LEASE_TIMEOUT = 30.0
+
+
+class SharedCache:
+    def __init__(self, data: Optional[Any] = None, lock: Optional[Any] = None) -> None:
+        self._data = data if data is not None else {}
+        self._lock = lock if lock is not None else threading.Lock()
+
+    def _claim(self, key: str, ttl: float) -> Tuple[bool, Any, bool]:
+        """
+        Returns ``(found, value, should_refresh)``. When ``should_refresh`` is
+        true the caller holds the lease for ``key`` and must store a value or
+        release it.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > now:
+                return True, entry[1], False
+
+            lease_key = f"lease:{key}"
+            lease = self._data.get(lease_key)
+            if lease is not None and lease > now:
+                return entry is not None, entry[1] if entry else None, False
+
+            self._data[lease_key] = now + LEASE_TIMEOUT
+            return entry is not None, entry[1] if entry else None, True
+
+    def _store(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (time.time() + ttl, value)
+            self._data.pop(f"lease:{key}", None)
+
+    def _release(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(f"lease:{key}", None)
+
+    async def fetch(self, key: str, ttl: float, refresh: Callable[[], Awaitable[Any]], poll_interval: float = 0.5) -> Any:
+        """
+        Returns the cached value for ``key`` if it is younger than ``ttl`` seconds.
+        Otherwise exactly one caller across all clusters runs ``refresh`` and
+        stores its result; the rest get the previous value, or wait for the
+        new one if there is no previous value. ``refresh`` must return
+        something picklable.
+        """
+        deadline = time.time() + LEASE_TIMEOUT
+        while True:
+            found, value, should_refresh = await asyncio.to_thread(self._claim, key, ttl)
+            if should_refresh:
+                break
+            if found or time.time() > deadline:
+                return value
+            await asyncio.sleep(poll_interval)
+
+        try:
+            value = await refresh()
+        except BaseException:
+            await asyncio.to_thread(self._release, key)
+            raise
+        await asyncio.to_thread(self._store, key, value, ttl)
+        return value